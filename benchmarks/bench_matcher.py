@@ -0,0 +1,59 @@
+"""Micro-benchmark: KeywordMatcher cost as the keyword list grows
+
+Run from the repository root:
+    python benchmarks/bench_matcher.py
+
+Prints the average time per lookup for the compiled matcher and for the
+old nested substring loop at increasing list sizes. The compiled
+matcher should stay roughly flat while the loop grows linearly.
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from script import KeywordMatcher  # noqa: E402
+
+LIST_SIZES = [100, 1000, 10000, 50000]
+LOOKUPS = 2000
+
+SAMPLE_NAMES = [
+    "Acme Creative Studio", "Key Solutions", "Riyadh Digital Agency", "شركة التقنية المتقدمة",
+    "Northwind Trading Co.", "Blue Ocean Software LLC", "Jeddah Media House", "Nova Labs",
+]
+
+def random_company(rng: random.Random) -> str:
+    words = rng.randint(1, 3)
+    return ' '.join(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(words))
+
+def naive_match(keywords, text: str) -> bool:
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in keywords)
+
+def time_per_lookup(func, texts) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        func(text)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+def main():
+    rng = random.Random(42)
+    texts = [rng.choice(SAMPLE_NAMES) for _ in range(LOOKUPS)]
+
+    print(f"{'keywords':>10} {'build (ms)':>12} {'matcher (us)':>14} {'loop (us)':>12}")
+    for size in LIST_SIZES:
+        keywords = [random_company(rng) for _ in range(size)]
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher({keyword: "blocked" for keyword in keywords})
+        build_ms = (time.perf_counter() - start) * 1000
+
+        matcher_us = time_per_lookup(matcher.search, texts)
+        loop_us = time_per_lookup(lambda text: naive_match(keywords, text), texts)
+        print(f"{size:>10} {build_ms:>12.1f} {matcher_us:>14.2f} {loop_us:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Offline throughput benchmark for the LinkedIn and Bayt card parsers
+
+Run from the repository root:
+    python benchmarks/bench_parsers.py [--iterations N] [--update-baseline]
+
+Each fixture in benchmarks/fixtures is parsed with the same lxml
+extraction code the scraper uses. For each one it reports cards/sec,
+time per field extractor and peak Python heap. tracemalloc does not
+see lxml's C-level tree, so the process's peak RSS is printed last.
+The run exits non-zero when a fixture's throughput falls more than the
+tolerance below the cards/sec recorded in baseline.json. Use --update-baseline on a quiet
+machine to re-record the baseline after an intentional change.
+"""
+import argparse
+import gzip
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import script  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+# fixture -> (parse function, card finder, field extractors)
+FIXTURES = {
+    "linkedin_search_full_scroll.html.gz": (
+        script.parse_linkedin_cards, script.find_linkedin_cards, script.LINKEDIN_FIELD_EXTRACTORS),
+    "linkedin_guest_fragment.html.gz": (
+        script.parse_linkedin_cards, script.find_linkedin_cards, script.LINKEDIN_FIELD_EXTRACTORS),
+    "bayt_search_results.html.gz": (
+        script.parse_bayt_cards, script.find_bayt_cards, script.BAYT_FIELD_EXTRACTORS),
+}
+
+def load_fixture(name: str) -> str:
+    with gzip.open(os.path.join(FIXTURES_DIR, name), 'rt', encoding='utf-8') as f:
+        return f.read()
+
+def field_timings(page_source: str, find_cards, extractors, iterations: int) -> dict:
+    """Total seconds spent in each field extractor, averaged per card"""
+    cards = find_cards(script.lxml_html.fromstring(page_source))
+    totals = {field: 0.0 for field in extractors}
+    for _ in range(iterations):
+        for card in cards:
+            fields = {}
+            for field, extractor in extractors.items():
+                start = time.perf_counter()
+                fields[field] = extractor(card, fields)
+                totals[field] += time.perf_counter() - start
+    samples = max(1, iterations * len(cards))
+    return {field: total / samples for field, total in totals.items()}
+
+def bench_fixture(name: str, iterations: int) -> dict:
+    parse, find_cards, extractors = FIXTURES[name]
+    page_source = load_fixture(name)
+
+    # Warm up once so first-call costs do not skew the numbers
+    cards = len(parse(page_source))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(page_source)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    parse(page_source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "page_kb": len(page_source.encode('utf-8')) / 1024,
+        "cards": cards,
+        "cards_per_sec": cards * iterations / elapsed,
+        "ms_per_page": elapsed / iterations * 1000,
+        "peak_mb": peak / (1024 * 1024),
+        "field_us": {field: seconds * 1e6 for field, seconds in
+                     field_timings(page_source, find_cards, extractors, iterations).items()},
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    tolerance = baseline.get("tolerance", 0.3)
+
+    failures = []
+    for name in FIXTURES:
+        result = bench_fixture(name, args.iterations)
+        print(f"\n{name}")
+        print(f"  page size:    {result['page_kb']:.0f} KB, {result['cards']} cards")
+        print(f"  throughput:   {result['cards_per_sec']:,.0f} cards/sec ({result['ms_per_page']:.1f} ms/page)")
+        print(f"  peak heap:    {result['peak_mb']:.1f} MB")
+        print("  per-field:    " + ", ".join(f"{field} {us:.1f}us" for field, us in result['field_us'].items()))
+
+        expected = baseline["cards_per_sec"].get(name)
+        if args.update_baseline:
+            baseline["cards_per_sec"][name] = round(result['cards_per_sec'])
+        elif expected and result['cards_per_sec'] < expected * (1 - tolerance):
+            failures.append(f"{name}: {result['cards_per_sec']:,.0f} cards/sec is more than "
+                            f"{tolerance:.0%} below the {expected:,} baseline")
+
+    # ru_maxrss is reported in KB on Linux
+    print(f"\nPeak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\nUpdated {BASELINE_PATH}")
+
+    if failures:
+        print("\nThroughput regression:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
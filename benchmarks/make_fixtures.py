@@ -0,0 +1,140 @@
+"""Generate the synthetic HTML fixture corpus used by bench_parsers.py
+
+Run from the repository root:
+    python benchmarks/make_fixtures.py
+
+These are not captures of real pages. The generator builds markup with
+the structure our selectors target, at realistic sizes: a LinkedIn
+search page after a full infinite-scroll load, a LinkedIn guest-search
+fragment and a Bayt results page. Company names, titles, IDs and filler
+text are all generated. The output is deterministic, so regenerating
+does not churn the checked-in files. If the live markup drifts, update
+the templates here to match.
+"""
+import gzip
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+LINKEDIN_FULL_PAGE_CARDS = 500
+LINKEDIN_FRAGMENT_CARDS = 10
+BAYT_PAGE_CARDS = 25
+
+TITLES = [
+    "Graphic Designer", "Senior Graphic Designer", "Full Stack Developer", "UI/UX Designer",
+    "Motion Graphic Designer", "Frontend Developer", "Backend Developer", "Web Developer",
+    "Mobile Developer", "React Developer", "Angular Developer", "مصمم جرافيك",
+    "Product Designer (Remote)", "Hybrid Frontend Engineer",
+]
+CITIES = ["Riyadh", "Jeddah", "Dammam", "Khobar", "Mecca", "Medina"]
+CAREER_LEVELS = ["Entry level", "Mid career", "Management", "Senior executive"]
+SYLLABLES = ["al", "nor", "vex", "tam", "ri", "zen", "qa", "lum", "dar", "sol", "mir", "ka"]
+SUFFIXES = ["Studio", "Labs", "Trading Co.", "LLC", "Digital", "Solutions", "Media House", "Group"]
+
+def company_name(rng: random.Random) -> str:
+    word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+    return f"{word} {rng.choice(SUFFIXES)}"
+
+def slug(text: str) -> str:
+    return ''.join(c if c.isalnum() else '-' for c in text.lower()).strip('-')
+
+def filler(rng: random.Random, words: int) -> str:
+    return ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in range(words))
+
+def page_chrome(rng: random.Random, body: str, title: str) -> str:
+    """Wrap results in the scripts, nav and footer bulk a real page carries"""
+    scripts = '\n'.join(
+        f'<script type="application/json" id="data-{i}">{{"payload": "{filler(rng, 120)}"}}</script>'
+        for i in range(150))
+    nav = ''.join(f'<li><a href="/nav/{i}" class="nav-link">{filler(rng, 2)}</a></li>' for i in range(60))
+    footer = ''.join(f'<p class="footer-text">{filler(rng, 30)}</p>' for i in range(30))
+    return (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title}</title>{scripts}</head>'
+            f'<body><header><nav><ul>{nav}</ul></nav></header><main>{body}</main>'
+            f'<footer>{footer}</footer></body></html>')
+
+def linkedin_card(rng: random.Random, index: int) -> str:
+    job_id = 3700000000 + rng.randint(0, 99999999)
+    title = rng.choice(TITLES)
+    company = company_name(rng)
+    city = rng.choice(CITIES)
+    day = rng.randint(1, 28)
+    return f'''<li>
+  <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}" data-impression-id="jobs-search-result-{index}" data-reference-id="{filler(rng, 1)}" data-tracking-id="{filler(rng, 1)}">
+    <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" href="https://sa.linkedin.com/jobs/view/{slug(title)}-at-{slug(company)}-{job_id}?position={index % 25 + 1}&amp;pageNum={index // 25}&amp;refId={filler(rng, 1)}&amp;trackingId={filler(rng, 1)}" data-tracking-control-name="public_jobs_jserp-result_search-card" data-tracking-will-navigate>
+      <span class="sr-only">{title}</span>
+    </a>
+    <div class="search-entity-media"><img class="artdeco-entity-image artdeco-entity-image--square-4" data-delayed-url="https://media.example.invalid/logo/{job_id}" alt="{company}"></div>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">
+        {title}
+      </h3>
+      <h4 class="base-search-card__subtitle">
+        <a class="hidden-nested-link" data-tracking-control-name="public_jobs_jserp-result_job-search-card-subtitle" href="https://sa.linkedin.com/company/{slug(company)}?trk=public_jobs_jserp-result_job-search-card-subtitle">
+          {company}
+        </a>
+      </h4>
+      <div class="base-search-card__metadata">
+        <span class="job-search-card__location">
+          {city}, {city}, Saudi Arabia
+        </span>
+        <div class="job-posting-benefits text-sm"><icon class="job-posting-benefits__icon" data-svg-class-name="job-posting-benefits__icon-svg"></icon><span class="job-posting-benefits__text">Actively Hiring</span></div>
+        <time class="job-search-card__listdate--new" datetime="2026-09-{day:02d}">
+          {rng.randint(1, 23)} hours ago
+        </time>
+      </div>
+    </div>
+  </div>
+</li>'''
+
+def bayt_card(rng: random.Random) -> str:
+    job_id = 4800000 + rng.randint(0, 999999)
+    title = rng.choice(TITLES)
+    company = company_name(rng)
+    city = rng.choice(CITIES)
+    low = rng.randint(5, 20) * 100
+    salary = f'<dt class="jb-label-salary"><span class="u-stretch"></span>${low:,} - ${low * 2:,}</dt>' if rng.random() < 0.5 else ''
+    return f'''<li class="has-pointer-d" data-js-job="" data-job-id="{job_id}" id="job-{job_id}">
+  <div class="row is-compact is-m no-wrap">
+    <div class="col">
+      <h2 class="jb-title m0 t-large"><a data-js-aid="jobID" href="/en/saudi-arabia/jobs/{slug(title)}-{job_id}/?xid={filler(rng, 1)}">{title}</a></h2>
+      <div class="job-company-location-wrapper">
+        <b class="jb-company"><a class="t-default t-bold" href="/en/company/{slug(company)}-{job_id % 9973}/">{company}</a></b>
+        <div class="t-mute t-small"><span>{city}</span> · <span>Saudi Arabia</span></div>
+      </div>
+    </div>
+    <div class="col u-none u-block-m"><img class="company-logo" data-src="https://media.example.invalid/logo/{job_id}" alt=""></div>
+  </div>
+  <div class="jb-descr m10t t-small">{filler(rng, 45)}</div>
+  <dl class="jb-label-wrapper">
+    <dt class="jb-label-careerlevel"><span class="u-stretch">icon</span> {rng.choice(CAREER_LEVELS)}</dt>
+    {salary}
+  </dl>
+  <div class="jb-date col p0x t-xsmall t-nowrap t-mute"><span data-automation-id="job-active-date">{rng.randint(1, 6)} days ago</span></div>
+</li>'''
+
+def write_fixture(name: str, html: str):
+    path = os.path.join(FIXTURES_DIR, name)
+    # mtime=0 keeps the gzip header stable across regenerations
+    with open(path, 'wb') as raw, gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) as f:
+        f.write(html.encode('utf-8'))
+    print(f"Wrote {path} ({len(html) / 1024:.0f} KB uncompressed)")
+
+def main():
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    rng = random.Random(20240601)
+
+    cards = '\n'.join(linkedin_card(rng, i) for i in range(LINKEDIN_FULL_PAGE_CARDS))
+    body = (f'<section class="two-pane-serp-page__results-list"><ul class="jobs-search__results-list">{cards}</ul>'
+            f'<button class="infinite-scroller__show-more-button" aria-label="See more jobs">See more jobs</button></section>')
+    write_fixture("linkedin_search_full_scroll.html.gz", page_chrome(rng, body, "Graphic Designer jobs in Saudi Arabia"))
+
+    fragment = '\n'.join(linkedin_card(rng, i) for i in range(LINKEDIN_FRAGMENT_CARDS))
+    write_fixture("linkedin_guest_fragment.html.gz", fragment)
+
+    cards = '\n'.join(bayt_card(rng) for _ in range(BAYT_PAGE_CARDS))
+    body = f'<div id="results_inner_card"><ul class="list-unstyled">{cards}</ul></div>'
+    write_fixture("bayt_search_results.html.gz", page_chrome(rng, body, "Graphic Designer Jobs in Saudi Arabia"))
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,30 @@
 import requests
+import base64
 import time
 import json
+import argparse
+import signal
+import socket
 import hashlib
 import logging
 import random
+import re
+import csv
+import sys
+import gzip
+import sqlite3
 import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Set
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Set, Optional, Tuple
+from dataclasses import dataclass, field, fields
+from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxml_html
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -18,12 +35,22 @@ from selenium.common.exceptions import NoSuchElementException
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 import os
+import schedule
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Updated user agents with more recent versions
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+]
+
+@dataclass(slots=True)
 class Job:
     company_name: str
     platform: str
@@ -33,20 +60,1940 @@ class Job:
     posted_time: str
     location: str = ""
     description_snippet: str = ""
+    source_links: List[str] = field(default_factory=list)
+    # Only some platforms list these (currently Bayt)
+    salary_info: Optional[str] = None
+    career_level: Optional[str] = None
+    description: Optional[str] = None
+    # Filled in from the detail page by the optional enrichment stage
+    employment_type: Optional[str] = None
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Flat copy; asdict's recursive deep copy dominated bulk sink writes
+        row = {name: getattr(self, name) for name in self.__slots__}
+        row["source_links"] = list(self.source_links)
+        return row
     
     def get_hash(self) -> str:
         """Generate unique hash for duplicate detection"""
         unique_string = f"{self.company_name}_{self.job_title}_{self.platform}"
         return hashlib.md5(unique_string.encode()).hexdigest()
+    
+    def get_dedupe_key(self) -> str:
+        """Key for cross-run dedupe: the platform's native job ID, falling back to get_hash"""
+        native_id = extract_native_job_id(self.job_link)
+        return native_id or f"hash:{self.get_hash()}"
+    
+    def get_source_keys(self) -> List[str]:
+        """Dedupe keys of this job and of every duplicate merged into it"""
+        keys = [self.get_dedupe_key()]
+        for link in self.source_links:
+            native_id = extract_native_job_id(link)
+            if native_id and native_id not in keys:
+                keys.append(native_id)
+        return keys
+
+# Native job IDs live at the end of the job slug, e.g. /jobs/view/graphic-designer-at-acme-3712345678
+LINKEDIN_JOB_ID_PATTERN = re.compile(r'/jobs/view/(?:[^/?#]*-)?(\d+)')
+BAYT_JOB_ID_PATTERN = re.compile(r'bayt\.com/.*/jobs/[^/?#]*-(\d+)/?')
+
+def extract_native_job_id(job_link: str) -> Optional[str]:
+    """Parse the platform-native job ID out of a LinkedIn or Bayt job link"""
+    if not job_link:
+        return None
+    match = LINKEDIN_JOB_ID_PATTERN.search(job_link)
+    if match and 'linkedin.com' in job_link:
+        return f"linkedin:{match.group(1)}"
+    match = BAYT_JOB_ID_PATTERN.search(job_link)
+    if match:
+        return f"bayt:{match.group(1)}"
+    return None
+
+class JobColumns:
+    """Column-oriented batch of jobs for bulk export. Low-cardinality strings are interned,
+    so thousands of rows share one copy of "LinkedIn", "Remote" or "Riyadh, Saudi Arabia"."""
+
+    COLUMNS = [f.name for f in fields(Job)]
+    INTERNED = {"platform", "job_type", "location", "career_level", "employment_type"}
+
+    def __init__(self, jobs: Optional[List[Job]] = None):
+        self.columns: Dict[str, list] = {name: [] for name in self.COLUMNS}
+        if jobs:
+            self.extend(jobs)
+
+    def __len__(self) -> int:
+        return len(self.columns["job_link"])
+
+    def append(self, job: Job):
+        for name in self.COLUMNS:
+            value = getattr(job, name)
+            if name in self.INTERNED and value:
+                value = sys.intern(value)
+            elif name == "source_links":
+                value = tuple(value)
+            self.columns[name].append(value)
+
+    def extend(self, jobs: List[Job]):
+        for job in jobs:
+            self.append(job)
+
+    def rows(self):
+        """Yield one dict per job"""
+        for values in zip(*(self.columns[name] for name in self.COLUMNS)):
+            row = dict(zip(self.COLUMNS, values))
+            row["source_links"] = list(row["source_links"])
+            yield row
+
+    def jobs(self) -> List[Job]:
+        return [Job(**row) for row in self.rows()]
+
+    def write_jsonl(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in self.rows():
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def write_csv(self, path: str):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.COLUMNS)
+            writer.writeheader()
+            for row in self.rows():
+                # One cell per job: merged duplicate links are newline-separated
+                row["source_links"] = "\n".join(row["source_links"])
+                writer.writerow(row)
+
+    def write_parquet(self, path: str):
+        """Needs the optional pyarrow package"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        arrays = {name: pa.array([list(links) for links in values], type=pa.list_(pa.string()))
+                  if name == "source_links"
+                  else pa.array(values, type=pa.string())
+                  for name, values in self.columns.items()}
+        table = pa.table(arrays)
+        # Dictionary-encode the interned columns on disk as well
+        pq.write_table(table, path, use_dictionary=sorted(self.INTERNED), compression='zstd')
+
+    def export(self, directory: str, formats: List[str], stem: str) -> List[str]:
+        """Write the batch as <directory>/<stem>.<format> for each format, returning the paths written"""
+        writers = {"jsonl": self.write_jsonl, "csv": self.write_csv, "parquet": self.write_parquet}
+        os.makedirs(directory, exist_ok=True)
+        written = []
+        for fmt in formats:
+            if fmt not in writers:
+                logger.warning(f"Unknown export format '{fmt}', skipping (available: {', '.join(writers)})")
+                continue
+            path = os.path.join(directory, f"{stem}.{fmt}")
+            try:
+                writers[fmt](path)
+                written.append(path)
+            except Exception as e:
+                logger.error(f"Failed to export {path}: {e}")
+        return written
+
+class SeenJobStore:
+    """SQLite-backed index of jobs already uploaded, kept across runs"""
+
+    def __init__(self, path: str = "seen_jobs.db", ttl_days: int = 30):
+        self.path = path
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                job_key TEXT PRIMARY KEY,
+                platform TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_jobs_last_seen ON seen_jobs (last_seen)")
+        # Every card a role's search returned, uploaded or not, for incremental pagination
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS scanned_cards (
+                role TEXT NOT NULL,
+                job_key TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (role, job_key)
+            )
+        """)
+        self.conn.commit()
+
+    def contains(self, job_key: str) -> bool:
+        """Primary-key membership check"""
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM seen_jobs WHERE job_key = ?", (job_key,)).fetchone()
+        return row is not None
+
+    def filter_new(self, jobs: List[Job]) -> List[Job]:
+        """Return jobs not seen in earlier runs, refreshing last_seen for the ones that were"""
+        now = datetime.now().isoformat(timespec='seconds')
+        new_jobs = []
+        known_keys = []
+        with self._lock:
+            for job in jobs:
+                # A merged job counts as seen if any of its source postings was
+                seen_keys = [job_key for job_key in job.get_source_keys()
+                             if self.conn.execute("SELECT 1 FROM seen_jobs WHERE job_key = ?", (job_key,)).fetchone()]
+                if not seen_keys:
+                    new_jobs.append(job)
+                else:
+                    known_keys.extend((now, job_key) for job_key in seen_keys)
+            self.conn.executemany("UPDATE seen_jobs SET last_seen = ? WHERE job_key = ?", known_keys)
+            self.conn.commit()
+        logger.info(f"Dedupe store: {len(new_jobs)} new jobs, {len(jobs) - len(new_jobs)} already seen")
+        return new_jobs
+
+    def record(self, jobs: List[Job]):
+        """Mark jobs as seen, keeping the original first_seen for existing keys"""
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [(job_key, job.platform, now, now) for job in jobs for job_key in job.get_source_keys()]
+        with self._lock:
+            self.conn.executemany("""
+                INSERT INTO seen_jobs (job_key, platform, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                ON CONFLICT(job_key) DO UPDATE SET last_seen = excluded.last_seen
+            """, rows)
+            self.conn.commit()
+
+    def record_scanned(self, role: str, job_keys: List[str]):
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            self.conn.executemany("""
+                INSERT INTO scanned_cards (role, job_key, last_seen) VALUES (?, ?, ?)
+                ON CONFLICT(role, job_key) DO UPDATE SET last_seen = excluded.last_seen
+            """, [(role, job_key, now) for job_key in job_keys])
+            self.conn.commit()
+
+    def scanned(self, role: str, job_keys: List[str]) -> Set[str]:
+        """The subset of job_keys an earlier search for this role already returned"""
+        found = set()
+        with self._lock:
+            for job_key in job_keys:
+                if self.conn.execute("SELECT 1 FROM scanned_cards WHERE role = ? AND job_key = ?",
+                                     (role, job_key)).fetchone():
+                    found.add(job_key)
+        return found
+
+    def compact(self) -> int:
+        """Drop entries not seen within the TTL, returning how many were removed"""
+        cutoff = (datetime.now() - timedelta(days=self.ttl_days)).isoformat(timespec='seconds')
+        with self._lock:
+            removed = self.conn.execute("DELETE FROM seen_jobs WHERE last_seen < ?", (cutoff,)).rowcount
+            self.conn.execute("DELETE FROM scanned_cards WHERE last_seen < ?", (cutoff,))
+            self.conn.commit()
+        if removed:
+            logger.info(f"Dedupe store: compacted {removed} entries older than {self.ttl_days} days")
+        return removed
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class SeenRunTracker:
+    """Watches a role's cards in result order and trips once `threshold` consecutive ones were
+    returned by an earlier search for the same role. Results are newest first, so the rest are older still."""
+
+    def __init__(self, store: SeenJobStore, role: str, threshold: int):
+        self.store = store
+        self.role = role
+        self.threshold = threshold
+        self.keys: List[str] = []
+        self.checked = 0
+        self.run = 0
+        self.stopped = False
+
+    def add(self, job_keys: List[Optional[str]]) -> bool:
+        """Feed the next cards in page order, returning True once pagination should stop"""
+        self.checked += len(job_keys)
+        self.keys.extend(key for key in job_keys if key)
+        seen = self.store.scanned(self.role, [key for key in job_keys if key])
+        for key in job_keys:
+            if self.stopped:
+                break
+            self.run = self.run + 1 if key in seen else 0
+            self.stopped = self.run >= self.threshold
+        return self.stopped
+
+LINKEDIN_URN_ID_PATTERN = re.compile(r'jobPosting:(\d+)')
+
+def linkedin_card_key(reference: Optional[str]) -> Optional[str]:
+    """Dedupe key from a card's entity URN, data-job-id or job link"""
+    if not reference:
+        return None
+    match = LINKEDIN_URN_ID_PATTERN.search(reference)
+    if match:
+        return f"linkedin:{match.group(1)}"
+    if reference.isdigit():
+        return f"linkedin:{reference}"
+    return extract_native_job_id(reference)
+
+class AirtableSyncCache:
+    """SQLite cache of the field hash last synced to Airtable for each Job Link"""
+
+    def __init__(self, path: str = "seen_jobs.db", ttl_days: int = 30):
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS airtable_sync (
+                job_link TEXT PRIMARY KEY,
+                fields_hash TEXT NOT NULL,
+                synced_at TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_airtable_sync_synced_at ON airtable_sync (synced_at)")
+        self.conn.commit()
+
+    @staticmethod
+    def fields_hash(fields: Dict) -> str:
+        """Stable hash of a record's fields, ignoring the per-run Scraped At stamp"""
+        stable_fields = {k: v for k, v in fields.items() if k != "Scraped At"}
+        return hashlib.md5(json.dumps(stable_fields, sort_keys=True).encode()).hexdigest()
+
+    def is_unchanged(self, fields: Dict) -> bool:
+        with self._lock:
+            row = self.conn.execute("SELECT fields_hash FROM airtable_sync WHERE job_link = ?",
+                                    (fields["Job Link"],)).fetchone()
+        return row is not None and row[0] == self.fields_hash(fields)
+
+    def record(self, records: List[Dict]):
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [(r["fields"]["Job Link"], self.fields_hash(r["fields"]), now) for r in records]
+        with self._lock:
+            self.conn.executemany("""
+                INSERT INTO airtable_sync (job_link, fields_hash, synced_at) VALUES (?, ?, ?)
+                ON CONFLICT(job_link) DO UPDATE SET fields_hash = excluded.fields_hash, synced_at = excluded.synced_at
+            """, rows)
+            self.conn.commit()
+
+    def compact(self) -> int:
+        """Drop entries not synced or confirmed unchanged within the TTL, returning how many were removed"""
+        cutoff = (datetime.now() - timedelta(days=self.ttl_days)).isoformat(timespec='seconds')
+        with self._lock:
+            removed = self.conn.execute("DELETE FROM airtable_sync WHERE synced_at < ?", (cutoff,)).rowcount
+            self.conn.commit()
+        if removed:
+            logger.info(f"Airtable sync cache: compacted {removed} entries older than {self.ttl_days} days")
+        return removed
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class JobDetailCache:
+    """SQLite cache of parsed job detail pages keyed by dedupe key, so a posting is fetched once per TTL"""
+
+    def __init__(self, path: str = "job_details.db", ttl_days: int = 14):
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_details (
+                job_key TEXT PRIMARY KEY,
+                details TEXT NOT NULL,
+                fetched_at TEXT NOT NULL
+            )
+        """)
+        cutoff = (datetime.now() - timedelta(days=ttl_days)).isoformat(timespec='seconds')
+        self.conn.execute("DELETE FROM job_details WHERE fetched_at < ?", (cutoff,))
+        self.conn.commit()
+
+    def get(self, job_key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT details FROM job_details WHERE job_key = ?", (job_key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, job_key: str, details: Dict):
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            self.conn.execute("""
+                INSERT INTO job_details (job_key, details, fetched_at) VALUES (?, ?, ?)
+                ON CONFLICT(job_key) DO UPDATE SET details = excluded.details, fetched_at = excluded.fetched_at
+            """, (job_key, json.dumps(details, ensure_ascii=False), now))
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class RunCheckpoint:
+    """SQLite state file of finished (platform, role) work items and their jobs, so a restarted run can resume"""
+
+    def __init__(self, path: str = "scrape_checkpoint.db", max_age_hours: float = 12):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS work_items (
+                platform TEXT NOT NULL,
+                role TEXT NOT NULL,
+                status TEXT NOT NULL,
+                jobs TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (platform, role)
+            )
+        """)
+        # Checkpoints from an older run would skip work that should be scraped fresh
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).isoformat(timespec='seconds')
+        expired = self.conn.execute("DELETE FROM work_items WHERE updated_at < ?", (cutoff,)).rowcount
+        self.conn.commit()
+        if expired:
+            logger.info(f"Checkpoint: discarded {expired} work item(s) older than {max_age_hours} hours")
+
+    def completed(self, platforms: Optional[List[str]] = None) -> Dict[Tuple[str, str], List[Job]]:
+        """Jobs of every work item that finished cleanly, keyed by (platform, role), optionally only for some platforms"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT platform, role, jobs FROM work_items WHERE status = 'completed'").fetchall()
+        return {(platform, role): [Job(**job) for job in json.loads(jobs)] for platform, role, jobs in rows
+                if platforms is None or platform in platforms}
+
+    def save(self, platform: str, role: str, jobs: List[Job], status: str = "completed"):
+        """Persist a work item's jobs; 'failed' items keep their jobs but are scraped again on resume"""
+        now = datetime.now().isoformat(timespec='seconds')
+        payload = json.dumps([job.to_dict() for job in jobs], ensure_ascii=False)
+        with self._lock:
+            self.conn.execute("""
+                INSERT INTO work_items (platform, role, status, jobs, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(platform, role) DO UPDATE SET
+                    status = excluded.status, jobs = excluded.jobs, updated_at = excluded.updated_at
+            """, (platform, role, status, payload, now))
+            self.conn.commit()
+
+    def clear(self, platforms: Optional[List[str]] = None):
+        """Forget the work items of the given platforms (or all) once their jobs have been uploaded"""
+        with self._lock:
+            if platforms is None:
+                self.conn.execute("DELETE FROM work_items")
+            else:
+                self.conn.executemany("DELETE FROM work_items WHERE platform = ?", [(p,) for p in platforms])
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class WorkQueue:
+    """Durable SQLite queue of (platform, role, page) tasks that worker processes claim under a lease"""
+
+    def __init__(self, path: str = "work_queue.db", lease_seconds: int = 900, max_attempts: int = 3):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # isolation_level=None lets claim() take the write lock up front with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                platform TEXT NOT NULL,
+                role TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                error TEXT,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, lease_expires)")
+
+    def enqueue(self, tasks: List[Tuple[str, str, int]]) -> int:
+        """Add tasks, skipping any already pending or leased, and return how many were added"""
+        now = datetime.now().isoformat(timespec='seconds')
+        added = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for platform, role, page in tasks:
+                exists = self.conn.execute("""
+                    SELECT 1 FROM tasks WHERE platform = ? AND role = ? AND page = ? AND status IN ('pending', 'leased')
+                """, (platform, role, page)).fetchone()
+                if not exists:
+                    self.conn.execute("INSERT INTO tasks (platform, role, page, updated_at) VALUES (?, ?, ?, ?)",
+                                      (platform, role, page, now))
+                    added += 1
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def claim(self, worker_id: str) -> Optional[Tuple[int, str, str, int]]:
+        """Lease the oldest pending task, or one whose lease expired, returning (id, platform, role, page)"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A task whose worker died on every attempt would otherwise be retried forever
+            self.conn.execute("""
+                UPDATE tasks SET status = 'failed', error = 'lease expired after the last attempt',
+                    lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+            """, (datetime.now().isoformat(timespec='seconds'), now, self.max_attempts))
+            row = self.conn.execute("""
+                SELECT id, platform, role, page FROM tasks
+                WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY id LIMIT 1
+            """, (now,)).fetchone()
+            if row:
+                self.conn.execute("""
+                    UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                        attempts = attempts + 1, updated_at = ?
+                    WHERE id = ?
+                """, (worker_id, now + self.lease_seconds, datetime.now().isoformat(timespec='seconds'), row[0]))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def complete(self, task_id: int, worker_id: str):
+        self._finish(task_id, worker_id, 'done', None)
+
+    def fail(self, task_id: int, worker_id: str, error: str):
+        """Return a failed task to the queue, or park it as failed once it has used max_attempts"""
+        attempts = self.conn.execute("SELECT attempts FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        status = 'failed' if attempts and attempts[0] >= self.max_attempts else 'pending'
+        self._finish(task_id, worker_id, status, error)
+
+    def _finish(self, task_id: int, worker_id: str, status: str, error: Optional[str]):
+        # A worker whose lease expired and was re-claimed must not overwrite the new owner's state
+        self.conn.execute("""
+            UPDATE tasks SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+            WHERE id = ? AND lease_owner = ?
+        """, (status, error, datetime.now().isoformat(timespec='seconds'), task_id, worker_id))
+
+    def outstanding(self) -> int:
+        """Tasks still pending or leased"""
+        return self.conn.execute("SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'leased')").fetchone()[0]
+
+    def prune(self, days: int = 7) -> int:
+        """Delete finished tasks older than the given number of days"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+        return self.conn.execute("DELETE FROM tasks WHERE status IN ('done', 'failed') AND updated_at < ?",
+                                 (cutoff,)).rowcount
+
+    def close(self):
+        self.conn.close()
+
+class StagingArea:
+    """Directory of per-task JSONL files that workers write and a single uploader drains"""
+
+    def __init__(self, path: str = "staging"):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, name: str, jobs: List[Job]) -> str:
+        """Write one task's jobs; the rename makes the file appear complete or not at all"""
+        final_path = os.path.join(self.path, f"{name}.jsonl")
+        tmp_path = os.path.join(self.path, f".{name}.jsonl.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for job in jobs:
+                f.write(json.dumps(job.to_dict(), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, final_path)
+        return final_path
+
+    def pending_files(self) -> List[str]:
+        return sorted(os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith(".jsonl"))
+
+    def load(self, paths: List[str]) -> List[Job]:
+        jobs = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                jobs.extend(Job(**json.loads(line)) for line in f if line.strip())
+        return jobs
+
+    def remove(self, paths: List[str]):
+        for path in paths:
+            os.remove(path)
+
+class PageArchive:
+    """Compressed snapshot archive of result pages for offline replay.
+
+    pages.dat holds each page compressed on its own (zstd when the optional zstandard package is
+    installed, gzip otherwise); index.jsonl has one line per page with its platform, role, page
+    number, codec and byte range."""
+
+    def __init__(self, path: str = "page_archive", mode: str = "r"):
+        self.path = path
+        self.data_path = os.path.join(path, "pages.dat")
+        self.index_path = os.path.join(path, "index.jsonl")
+        self._lock = threading.Lock()
+        self.codec = "gzip"
+        self._zstd = None
+        try:
+            import zstandard
+            self._zstd = zstandard
+            self.codec = "zstd"
+        except ImportError:
+            pass
+        if mode == "w":
+            # Each recording starts a fresh archive
+            os.makedirs(path, exist_ok=True)
+            self.data_file = open(self.data_path, 'wb')
+            self.index_file = open(self.index_path, 'w', encoding='utf-8')
+            self.offset = 0
+        else:
+            self.data_file = open(self.data_path, 'rb')
+            self.index_file = None
+
+    def add(self, platform: str, role: str, page: int, page_source: str):
+        raw = page_source.encode('utf-8')
+        if self.codec == "zstd":
+            blob = self._zstd.ZstdCompressor(level=10).compress(raw)
+        else:
+            blob = gzip.compress(raw, compresslevel=6)
+        with self._lock:
+            self.data_file.write(blob)
+            entry = {"platform": platform, "role": role, "page": page, "codec": self.codec,
+                     "offset": self.offset, "length": len(blob), "size": len(raw),
+                     "recorded_at": datetime.now().isoformat(timespec='seconds')}
+            self.offset += len(blob)
+            self.index_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.data_file.flush()
+            self.index_file.flush()
+
+    def entries(self) -> List[Dict]:
+        """Index entries sorted by (platform, role, page), so replays run in a stable order"""
+        with open(self.index_path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return sorted(entries, key=lambda e: (e["platform"], e["role"], e["page"]))
+
+    def read(self, entry: Dict) -> str:
+        with self._lock:
+            self.data_file.seek(entry["offset"])
+            blob = self.data_file.read(entry["length"])
+        if entry["codec"] == "zstd":
+            if self._zstd is None:
+                raise RuntimeError("This archive is zstd-compressed; install zstandard to replay it")
+            raw = self._zstd.ZstdDecompressor().decompress(blob, max_output_size=entry["size"])
+        else:
+            raw = gzip.decompress(blob)
+        return raw.decode('utf-8')
+
+    def close(self):
+        self.data_file.close()
+        if self.index_file:
+            self.index_file.close()
+
+class JobSink:
+    """Destination for scraped jobs. Sinks with new_only set receive only jobs no earlier run has seen (every
+    unique job when Airtable upserts, so changed postings re-sync); the others receive each work item's jobs as it completes, and upserting ones the final merged jobs too."""
+
+    name = ""
+    new_only = False
+    upserts = False
+
+    def write(self, jobs: List[Job]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SQLiteJobSink(JobSink):
+    """Local SQLite table of every unique job, upserted on the dedupe key; the record --resync replays"""
+
+    name = "sqlite"
+    upserts = True
+
+    def __init__(self, path: str = "jobs.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # Single local writer: WAL with NORMAL sync keeps bulk inserts fast and still crash-safe
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_key TEXT PRIMARY KEY,
+                platform TEXT,
+                job TEXT NOT NULL,
+                first_scraped TEXT NOT NULL,
+                last_scraped TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_last_scraped ON jobs (last_scraped)")
+        self.conn.commit()
+
+    def write(self, jobs: List[Job]):
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [(job.get_dedupe_key(), job.platform, json.dumps(job.to_dict(), ensure_ascii=False), now, now)
+                for job in jobs]
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO jobs (job_key, platform, job, first_scraped, last_scraped) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(job_key) DO UPDATE SET job = excluded.job, last_scraped = excluded.last_scraped
+            """, rows)
+
+    def load(self, since_days: Optional[float] = None) -> List[Job]:
+        """Jobs scraped within the last since_days, or all of them"""
+        query, params = "SELECT job FROM jobs", ()
+        if since_days is not None:
+            cutoff = (datetime.now() - timedelta(days=since_days)).isoformat(timespec='seconds')
+            query, params = "SELECT job FROM jobs WHERE last_scraped >= ?", (cutoff,)
+        return [Job(**json.loads(row[0])) for row in self.conn.execute(query, params)]
+
+    def close(self):
+        self.conn.close()
+
+class JSONLJobSink(JobSink):
+    """Append-only JSON Lines file, one job per line"""
+
+    name = "jsonl"
+
+    def __init__(self, path: str = "jobs.jsonl"):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, jobs: List[Job]):
+        self.file.write(''.join(json.dumps(job.to_dict(), ensure_ascii=False) + "\n" for job in jobs))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class CSVJobSink(JobSink):
+    """Append-only CSV file with the JobColumns header"""
+
+    name = "csv"
+
+    def __init__(self, path: str = "jobs.csv"):
+        self.path = path
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'a', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=JobColumns.COLUMNS)
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, jobs: List[Job]):
+        for job in jobs:
+            row = job.to_dict()
+            row["source_links"] = "\n".join(row["source_links"])
+            self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class AirtableJobSink(JobSink):
+    """Uploads new jobs through the scraper's Airtable writer and marks the saved ones as seen"""
+
+    name = "airtable"
+    new_only = True
+
+    def __init__(self, scraper: 'JobScraper'):
+        self.scraper = scraper
+
+    def write(self, jobs: List[Job]):
+        with self.scraper.metrics.stage("airtable_upload"):
+            saved_jobs = self.scraper.save_to_airtable(jobs)
+        self.scraper.seen_store.record(saved_jobs)
+
+SINK_TYPES = {
+    "sqlite": SQLiteJobSink,
+    "jsonl": JSONLJobSink,
+    "csv": CSVJobSink,
+}
+
+class BufferedSink:
+    """Runs a sink on its own thread, writing queued jobs in batches so a slow sink never blocks scraping"""
+
+    def __init__(self, sink: JobSink, batch_size: int = 1000, flush_seconds: float = 2.0):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.written = 0
+        self.failed = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"sink-{sink.name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, jobs: List[Job]):
+        if jobs:
+            self._queue.put(jobs)
+
+    def _run(self):
+        pending: List[Job] = []
+        closing = False
+        while not closing:
+            try:
+                item = self._queue.get(timeout=self.flush_seconds)
+                if item is None:
+                    closing = True
+                else:
+                    pending.extend(item)
+                    # Keep collecting while more work is already queued and the batch has room
+                    if len(pending) < self.batch_size and not self._queue.empty():
+                        continue
+            except queue.Empty:
+                pass
+            while pending:
+                batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+                self._write(batch)
+
+    def _write(self, batch: List[Job]):
+        try:
+            self.sink.write(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"{self.sink.name} sink failed to write {len(batch)} job(s): {e}")
+
+    def close(self):
+        """Write everything still queued, then close the sink"""
+        self._queue.put(None)
+        self._thread.join()
+        self.sink.close()
+        logger.info(f"{self.sink.name} sink: {self.written} job(s) written, {self.failed} failed")
+
+class TokenBucket:
+    """Thread-safe token bucket that paces callers to a steady request rate"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class AdaptiveTokenBucket(TokenBucket):
+    """Token bucket whose rate follows AIMD: creep up on clean responses, cut sharply on block signals"""
+
+    def __init__(self, name: str, initial_rate: float, min_rate: float, max_rate: float,
+                 increase: float = 0.05, decrease: float = 0.5, soft_decrease: float = 0.8):
+        # Capacity 1: an adaptive rate is only meaningful without bursts
+        super().__init__(min(max(initial_rate, min_rate), max_rate), capacity=1)
+        self.name = name
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.soft_decrease = soft_decrease
+        self.successes = 0
+        self.backoffs = 0
+
+    def record_success(self):
+        """Additive increase after a response that showed no sign of throttling"""
+        with self._lock:
+            self.successes += 1
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_backoff(self, reason: str, soft: bool = False):
+        """Multiplicative decrease; soft signals (e.g. zero cards) cut less than 429s, captchas or login walls"""
+        with self._lock:
+            self.backoffs += 1
+            old_rate = self.rate
+            self.rate = max(self.min_rate, self.rate * (self.soft_decrease if soft else self.decrease))
+            # Spend the saved-up token so the very next request already waits at the new rate
+            self.tokens = min(self.tokens, 0)
+            new_rate = self.rate
+        log = logger.info if soft else logger.warning
+        log(f"Politeness {self.name}: backing off ({reason}), {old_rate:.2f} -> {new_rate:.2f} req/s")
+
+class PolitenessScheduler:
+    """One adaptive token bucket per domain, shared by every thread that talks to that domain"""
+
+    DEFAULTS = {
+        "api.airtable.com": {"initial_rate": 5.0, "min_rate": 0.5, "max_rate": 5.0},
+    }
+    FALLBACK = {"initial_rate": 0.5, "min_rate": 0.05, "max_rate": 2.0}
+
+    def __init__(self, domain_config: Dict, defaults: Optional[Dict] = None):
+        """defaults adds per-domain settings (e.g. from platform scrapers) under the configured ones"""
+        defaults = {**self.DEFAULTS, **(defaults or {})}
+        self.buckets: Dict[str, AdaptiveTokenBucket] = {}
+        for domain in set(defaults) | set(domain_config):
+            settings = {**defaults.get(domain, self.FALLBACK), **domain_config.get(domain, {})}
+            self.buckets[domain] = AdaptiveTokenBucket(domain, **settings)
+
+    def bucket(self, domain: str) -> AdaptiveTokenBucket:
+        return self.buckets[domain]
+
+    def wait(self, domain: str):
+        """Block until the domain's bucket allows another request"""
+        self.buckets[domain].acquire()
+
+    def success(self, domain: str):
+        self.buckets[domain].record_success()
+
+    def backoff(self, domain: str, reason: str, soft: bool = False):
+        self.buckets[domain].record_backoff(reason, soft)
+
+    def describe(self) -> str:
+        return ", ".join(f"{domain} {bucket.rate:.2f} req/s ({bucket.successes} ok, {bucket.backoffs} backoffs)"
+                         for domain, bucket in sorted(self.buckets.items()))
+
+# Signs that a site answered with a login wall or bot challenge instead of results
+LOGIN_WALL_URL_PATTERN = re.compile(r'/(?:authwall|login|uas/login|checkpoint/challenge)', re.IGNORECASE)
+CHALLENGE_TITLE_PATTERN = re.compile(r'just a moment|attention required|security (?:check|verification)|captcha|are you a robot',
+                                     re.IGNORECASE)
+# 999 is LinkedIn's bot-detection status
+THROTTLE_STATUS_CODES = {403, 429, 503, 999}
+HTML_TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+def detect_block_signal(url: str, title: str) -> Optional[str]:
+    """Return 'login wall' or 'captcha' when the final URL or page title shows the request was blocked"""
+    if LOGIN_WALL_URL_PATTERN.search(url or ''):
+        return "login wall"
+    if CHALLENGE_TITLE_PATTERN.search(title or ''):
+        return "captcha"
+    return None
+
+def html_title(page_source: str) -> str:
+    match = HTML_TITLE_PATTERN.search(page_source[:20000])
+    return match.group(1).strip() if match else ""
+
+class AirtableWriter:
+    """Pooled, rate-limited Airtable client with retries and a dead-letter file for failed batches"""
+
+    def __init__(self, api_key: str, requests_per_second: float = 5, max_in_flight: int = 3,
+                 max_retries: int = 5, dead_letter_path: str = "airtable_dead_letter.jsonl",
+                 bucket: Optional[TokenBucket] = None):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.dead_letter_path = dead_letter_path
+        # An adaptive bucket also learns from 429s; a plain one just paces
+        self.bucket = bucket or TokenBucket(requests_per_second)
+        self._dead_letter_lock = threading.Lock()
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_in_flight)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def request(self, method: str, url: str, payload: Dict) -> Optional[requests.Response]:
+        """Send one request, retrying 429/5xx and connection errors with exponential backoff"""
+        response = None
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.request(method, url, data=json.dumps(payload), timeout=30)
+            except requests.RequestException as e:
+                logger.warning(f"Airtable request error (attempt {attempt + 1}): {e}")
+                response = None
+            else:
+                if response.status_code != 429 and response.status_code < 500:
+                    if isinstance(self.bucket, AdaptiveTokenBucket):
+                        self.bucket.record_success()
+                    return response
+                logger.warning(f"Airtable returned {response.status_code} (attempt {attempt + 1})")
+                if response.status_code == 429 and isinstance(self.bucket, AdaptiveTokenBucket):
+                    self.bucket.record_backoff("HTTP 429")
+            
+            if attempt == self.max_retries:
+                break
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = min(2 ** attempt, 30) + random.uniform(0, 0.5)
+            time.sleep(delay)
+        return response
+
+    def send_batches(self, method: str, url: str, payloads: List[Dict]) -> List[Optional[Dict]]:
+        """Send payloads with a few batches in flight, returning each response body or None if it failed"""
+        
+        def send(payload):
+            response = self.request(method, url, payload)
+            if response is not None and response.status_code == 200:
+                return response.json()
+            status = response.status_code if response is not None else None
+            detail = response.text if response is not None else "no response"
+            logger.error(f"Failed to save batch to Airtable: {status}, {detail}")
+            self.dead_letter(method, url, payload, status, detail)
+            return None
+        
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            return list(executor.map(send, payloads))
+
+    def dead_letter(self, method: str, url: str, payload: Dict, status: Optional[int], detail: str):
+        """Append a permanently failed request to the dead-letter JSONL file"""
+        entry = {
+            "failed_at": datetime.now().isoformat(timespec='seconds'),
+            "method": method,
+            "url": url,
+            "status": status,
+            "detail": detail[:500],
+            "payload": payload,
+        }
+        with self._dead_letter_lock:
+            with open(self.dead_letter_path, 'a') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def replay_dead_letters(self) -> List[Dict]:
+        """Resend dead-lettered requests, keeping only the ones that fail again; returns the records that went through"""
+        replaying_path = f"{self.dead_letter_path}.replaying"
+        records = []
+        # A replay killed midway left its unsent entries behind; finish those first
+        if os.path.exists(replaying_path):
+            records.extend(self._replay_file(replaying_path))
+        with self._dead_letter_lock:
+            if not os.path.exists(self.dead_letter_path):
+                return records
+            # Failures during the replay append to a fresh dead-letter file
+            os.replace(self.dead_letter_path, replaying_path)
+        records.extend(self._replay_file(replaying_path))
+        return records
+
+    def _replay_file(self, path: str) -> List[Dict]:
+        with open(path) as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        
+        logger.info(f"Replaying {len(entries)} dead-lettered Airtable requests...")
+        replayed = 0
+        records = []
+        for index, entry in enumerate(entries):
+            response = self.request(entry["method"], entry["url"], entry["payload"])
+            if response is not None and response.status_code == 200:
+                replayed += 1
+                records.extend(entry["payload"].get("records", []))
+            else:
+                status = response.status_code if response is not None else None
+                detail = response.text if response is not None else "no response"
+                self.dead_letter(entry["method"], entry["url"], entry["payload"], status, detail)
+            # Drop each handled entry, so a crash loses nothing and resends at most one request
+            self._rewrite_entries(path, entries[index + 1:])
+        os.remove(path)
+        logger.info(f"Replayed {replayed}/{len(entries)} dead-lettered Airtable requests")
+        return records
+
+    @staticmethod
+    def _rewrite_entries(path: str, entries: List[Dict]):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(''.join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        os.replace(temp_path, path)
+
+    def close(self):
+        self.session.close()
+
+class DriverWatchdog:
+    """Tracks result pages loaded and renderer memory per driver, and says when a driver is due for a restart.
+    A page is a navigation or a batch of cards brought in by a scroll or a 'See more' click."""
+
+    def __init__(self, max_pages: int = 100, max_heap_mb: float = 1024, max_dom_nodes: int = 150000):
+        self.max_pages = max_pages
+        self.max_heap_mb = max_heap_mb
+        self.max_dom_nodes = max_dom_nodes
+        self._lock = threading.Lock()
+        self._pages: Dict[int, int] = {}
+        self._heap_mb: Dict[int, float] = {}
+        self._dom_nodes: Dict[int, int] = {}
+        self._metrics_enabled: Set[int] = set()
+
+    def page_loaded(self, driver):
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+
+    def sample(self, driver) -> Tuple[float, int]:
+        """Read the renderer's JS heap in MB and its DOM node count from CDP Performance.getMetrics.
+        Unlike performance.memory these are exact, and DOM nodes live outside the V8 heap, so both are tracked."""
+        try:
+            if id(driver) not in self._metrics_enabled:
+                driver.execute_cdp_cmd("Performance.enable", {})
+                with self._lock:
+                    self._metrics_enabled.add(id(driver))
+            metrics = {metric["name"]: metric["value"]
+                       for metric in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+        except Exception:
+            return 0.0, 0
+        heap_mb = metrics.get("JSHeapUsedSize", 0) / (1024 * 1024)
+        dom_nodes = int(metrics.get("Nodes", 0))
+        with self._lock:
+            self._heap_mb[id(driver)] = max(heap_mb, self._heap_mb.get(id(driver), 0.0))
+            self._dom_nodes[id(driver)] = max(dom_nodes, self._dom_nodes.get(id(driver), 0))
+        return heap_mb, dom_nodes
+
+    def over_limits(self, heap_mb: float, dom_nodes: int) -> bool:
+        return bool((self.max_heap_mb and heap_mb > self.max_heap_mb)
+                    or (self.max_dom_nodes and dom_nodes > self.max_dom_nodes))
+
+    def over_memory(self, driver) -> bool:
+        return self.over_limits(*self.sample(driver))
+
+    def needs_recycle(self, driver) -> bool:
+        with self._lock:
+            pages = self._pages.get(id(driver), 0)
+            heap_mb = self._heap_mb.get(id(driver), 0.0)
+            dom_nodes = self._dom_nodes.get(id(driver), 0)
+        if self.max_pages and pages >= self.max_pages:
+            logger.info(f"Recycling driver after {pages} pages")
+            return True
+        if self.over_limits(heap_mb, dom_nodes):
+            logger.info(f"Recycling driver after its renderer reached {heap_mb:.0f} MB JS heap, {dom_nodes} DOM nodes")
+            return True
+        return False
+
+    def forget(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self._heap_mb.pop(id(driver), None)
+            self._dom_nodes.pop(id(driver), None)
+            self._metrics_enabled.discard(id(driver))
+
+class DriverPool:
+    """Fixed-size pool of Chrome drivers shared by scraping workers"""
+
+    def __init__(self, driver_factory, size: int, watchdog: Optional[DriverWatchdog] = None):
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self.watchdog = watchdog
+        self.drivers = []
+        self._available = queue.Queue()
+
+    def start(self):
+        """Build every driver up front so each worker owns one browser"""
+        try:
+            for worker_index in range(self.size):
+                driver = self.driver_factory(worker_index)
+                self.drivers.append(driver)
+                self._available.put(driver)
+        except Exception:
+            # Nothing keeps a pool that failed to start, so quit the browsers already launched
+            logger.error(f"Driver pool failed to start after {len(self.drivers)} of {self.size} driver(s)")
+            self.close()
+            raise
+        logger.info(f"Driver pool started with {self.size} worker(s)")
+        return self
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a driver for one work item and hand it back afterwards"""
+        driver = self._available.get()
+        try:
+            yield driver
+        finally:
+            # Restart between work items, so a finished role's jobs are already checkpointed
+            if self.watchdog and self.watchdog.needs_recycle(driver):
+                try:
+                    driver = self.replace(driver)
+                except Exception as e:
+                    # The health check replaces it later
+                    logger.error(f"Failed to restart driver: {e}")
+            self._available.put(driver)
+
+    def replace(self, driver):
+        """Quit a driver and start a fresh one in its slot"""
+        index = self.drivers.index(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if self.watchdog:
+            self.watchdog.forget(driver)
+        driver = self.driver_factory(index)
+        self.drivers[index] = driver
+        return driver
+
+    def check_health(self) -> int:
+        """Ping every idle driver and replace any that stopped responding, returning how many were replaced"""
+        replaced = 0
+        for _ in range(self._available.qsize()):
+            driver = self._available.get()
+            try:
+                driver.execute_script("return 1")
+            except Exception as e:
+                logger.warning(f"Driver failed health check, replacing it: {e}")
+                try:
+                    driver = self.replace(driver)
+                    replaced += 1
+                except Exception as e:
+                    # The dead driver keeps its slot, so the next health check tries again
+                    logger.error(f"Failed to restart driver, will retry at the next health check: {e}")
+            self._available.put(driver)
+        return replaced
+
+    def close(self):
+        """Quit all drivers, continuing past any that fail to shut down"""
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.warning(f"Error shutting down driver: {e}")
+        self.drivers = []
+
+class RunMetrics:
+    """Thread-safe stage timers and counters, keyed by (name, platform, role)"""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.stage_seconds: Dict[Tuple[str, str, str], float] = {}
+        self.stage_calls: Dict[Tuple[str, str, str], int] = {}
+        self.counters: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, platform: str = "", role: str = ""):
+        """Time the enclosed block and add it to the stage's running total"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            key = (name, platform, role)
+            with self._lock:
+                self.stage_seconds[key] = self.stage_seconds.get(key, 0.0) + elapsed
+                self.stage_calls[key] = self.stage_calls.get(key, 0) + 1
+
+    def count(self, name: str, value: int = 1, platform: str = "", role: str = ""):
+        """Add value to a named counter"""
+        key = (name, platform, role)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def value(self, name: str, platform: str = "", role: str = "") -> int:
+        with self._lock:
+            return self.counters.get((name, platform, role), 0)
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Seconds per stage summed over every platform and role"""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for (name, _, _), seconds in self.stage_seconds.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        return {name: round(seconds, 2) for name, seconds in sorted(totals.items())}
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            stages = [
+                {"stage": name, "platform": platform, "role": role,
+                 "seconds": round(seconds, 3), "calls": self.stage_calls[(name, platform, role)]}
+                for (name, platform, role), seconds in sorted(self.stage_seconds.items())
+            ]
+            counters = [
+                {"counter": name, "platform": platform, "role": role, "value": value}
+                for (name, platform, role), value in sorted(self.counters.items())
+            ]
+        return {
+            "run_duration": round(time.monotonic() - self.started_at, 2),
+            "stage_totals": self.stage_totals(),
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        logger.info(f"Wrote run metrics to {path}")
+
+    @staticmethod
+    def _labels(**labels) -> str:
+        """Render a Prometheus label set, escaping backslashes, quotes and newlines"""
+        pairs = []
+        for key, value in labels.items():
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{key}="{value}"')
+        return "{" + ",".join(pairs) + "}"
+
+    def write_prometheus(self, path: str):
+        """Write the metrics in the node_exporter textfile collector format"""
+        data = self.to_dict()
+        lines = [
+            "# HELP job_scraper_stage_seconds Time spent in each scraper stage.",
+            "# TYPE job_scraper_stage_seconds gauge",
+        ]
+        for entry in data["stages"]:
+            labels = self._labels(stage=entry["stage"], platform=entry["platform"], role=entry["role"])
+            lines.append(f"job_scraper_stage_seconds{labels} {entry['seconds']}")
+        lines += [
+            "# HELP job_scraper_stage_calls Number of times each scraper stage ran.",
+            "# TYPE job_scraper_stage_calls gauge",
+        ]
+        for entry in data["stages"]:
+            labels = self._labels(stage=entry["stage"], platform=entry["platform"], role=entry["role"])
+            lines.append(f"job_scraper_stage_calls{labels} {entry['calls']}")
+        lines += [
+            "# HELP job_scraper_count Scraper counters such as cards found and jobs extracted.",
+            "# TYPE job_scraper_count gauge",
+        ]
+        for entry in data["counters"]:
+            labels = self._labels(counter=entry["counter"], platform=entry["platform"], role=entry["role"])
+            lines.append(f"job_scraper_count{labels} {entry['value']}")
+        lines += [
+            "# HELP job_scraper_run_duration_seconds Wall-clock duration of the scraper run.",
+            "# TYPE job_scraper_run_duration_seconds gauge",
+            f"job_scraper_run_duration_seconds {data['run_duration']}",
+        ]
+        # Write then rename so the collector never reads a half-written file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        logger.info(f"Wrote Prometheus metrics to {path}")
+
+# URL patterns (Network.setBlockedURLs wildcards) that no scrape needs: media, fonts and third-party tracking
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+    "*.mp4*", "*.webm*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*clarity.ms*", "*snap.licdn.com*",
+    "*ads.linkedin.com*", "*px.ads.linkedin.com*", "*bat.bing.com*", "*criteo.*", "*taboola.com*",
+]
+
+# Results per seeMoreJobPostings fragment; queue tasks address guest pages by start = page * size
+LINKEDIN_GUEST_PAGE_SIZE = 10
+
+# Responses that carry LinkedIn result cards: the search page itself and the "See more" fragments
+LINKEDIN_RESULTS_URL_PATTERN = re.compile(r'linkedin\.com/jobs(?:-guest/jobs/api/seeMoreJobPostings/search|/search)')
+
+def summarize_network_events(events: List[Dict]) -> Dict:
+    """Tally allowed bytes and blocked requests from Chrome performance-log Network events"""
+    summary = {"allowed_requests": 0, "allowed_bytes": 0, "blocked_requests": 0, "failed_requests": 0,
+               "bytes_by_type": {}}
+    resource_types = {}
+    for event in events:
+        method, params = event.get("method"), event.get("params", {})
+        if method == "Network.responseReceived":
+            resource_types[params.get("requestId")] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            size = int(params.get("encodedDataLength", 0))
+            resource_type = resource_types.get(params.get("requestId"), "Other")
+            summary["allowed_requests"] += 1
+            summary["allowed_bytes"] += size
+            summary["bytes_by_type"][resource_type] = summary["bytes_by_type"].get(resource_type, 0) + size
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason"):
+                summary["blocked_requests"] += 1
+            else:
+                summary["failed_requests"] += 1
+    return summary
+
+# Selectors for LinkedIn's "See more jobs" button, in fallback order
+LINKEDIN_SEE_MORE_SELECTORS = [
+    "button[aria-label='See more jobs']",
+    ".infinite-scroller__show-more-button",
+    ".jobs-search-results__pagination button",
+]
+
+# Selectors for LinkedIn result cards, in fallback order
+LINKEDIN_CARD_SELECTORS = [
+    ".job-search-card",
+    ".base-search-card",
+    ".jobs-search-results__list-item",
+    ".job-result-card",
+    ".jobs-search__results-list li",
+    "[data-job-id]",
+    "[data-entity-urn*='jobPosting']"
+]
+
+LINKEDIN_FIELD_SELECTORS = {
+    'job_title': [".base-search-card__title", "h3", ".sr-only"],
+    'company_name': [".base-search-card__subtitle a", ".base-search-card__subtitle", "h4 a", "h4"],
+    'location': [".job-search-card__location", ".job-result-card__location"],
+    'job_link': [".base-card__full-link", "a[href*='/jobs/view/']", "a"],
+    'posted_time': [".job-search-card__listdate--new", "time", "[datetime]"],
+}
+
+def _has_class(class_name: str) -> str:
+    """XPath predicate matching a single CSS class token"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+# XPath equivalents of the CSS selectors above, compiled once at import time
+LINKEDIN_CARD_XPATHS = [etree.XPath(expr) for expr in [
+    f"//*[{_has_class('job-search-card')}]",
+    f"//*[{_has_class('base-search-card')}]",
+    f"//*[{_has_class('jobs-search-results__list-item')}]",
+    f"//*[{_has_class('job-result-card')}]",
+    f"//*[{_has_class('jobs-search__results-list')}]//li",
+    "//*[@data-job-id]",
+    "//*[contains(@data-entity-urn, 'jobPosting')]",
+]]
+
+LINKEDIN_FIELD_XPATHS = {
+    'job_title': [etree.XPath(expr) for expr in [
+        f".//*[{_has_class('base-search-card__title')}]",
+        ".//h3",
+        f".//*[{_has_class('sr-only')}]",
+    ]],
+    'company_name': [etree.XPath(expr) for expr in [
+        f".//*[{_has_class('base-search-card__subtitle')}]//a",
+        f".//*[{_has_class('base-search-card__subtitle')}]",
+        ".//h4//a",
+        ".//h4",
+    ]],
+    'location': [etree.XPath(expr) for expr in [
+        f".//*[{_has_class('job-search-card__location')}]",
+        f".//*[{_has_class('job-result-card__location')}]",
+    ]],
+    'job_link': [etree.XPath(expr) for expr in [
+        f".//*[{_has_class('base-card__full-link')}]",
+        ".//a[contains(@href, '/jobs/view/')]",
+        ".//a",
+    ]],
+    'posted_time': [etree.XPath(expr) for expr in [
+        f".//*[{_has_class('job-search-card__listdate--new')}]",
+        ".//time",
+        ".//*[@datetime]",
+    ]],
+}
+
+BAYT_CARD_XPATH = etree.XPath(f"//*[{_has_class('has-pointer-d')}]")
+BAYT_FIELD_XPATHS = {
+    'title_link': etree.XPath(".//h2//a"),
+    'company_link': etree.XPath(f".//a[{_has_class('t-default')} and {_has_class('t-bold')}]"),
+    'company_bold': etree.XPath(f".//*[{_has_class('job-company-location-wrapper')}]//b"),
+    'bold_text': etree.XPath(f".//*[self::b or {_has_class('t-bold')}]"),
+    'location': etree.XPath(f".//div[{_has_class('t-mute')} and {_has_class('t-small')}]"),
+    'salary': etree.XPath(f".//dt[{_has_class('jb-label-salary')}]"),
+    'description': etree.XPath(f".//div[{_has_class('jb-descr')}]"),
+    'career_level': etree.XPath(f".//dt[{_has_class('jb-label-careerlevel')}]"),
+    'posted_time': etree.XPath(".//span[@data-automation-id='job-active-date']"),
+}
+
+def _element_text(elem) -> str:
+    """Whitespace-normalized text content of an lxml element"""
+    return ' '.join(elem.text_content().split())
+
+def _first_text(card, xpaths) -> str:
+    for xpath in xpaths:
+        for elem in xpath(card):
+            text = _element_text(elem)
+            if text:
+                return text
+            break
+    return ""
+
+def _parse_html(page_source: str):
+    if not page_source or not page_source.strip():
+        return None
+    return lxml_html.fromstring(page_source)
+
+def _linkedin_job_link(card, fields: Dict) -> str:
+    job_link = ""
+    for xpath in LINKEDIN_FIELD_XPATHS['job_link']:
+        matches = xpath(card)
+        if not matches:
+            continue
+        job_link = urljoin("https://www.linkedin.com", matches[0].get('href', ''))
+        if '/jobs/view/' in job_link:
+            job_link = job_link.split('?')[0]
+            break
+    return job_link
+
+def _linkedin_posted_time(card, fields: Dict) -> str:
+    for xpath in LINKEDIN_FIELD_XPATHS['posted_time']:
+        matches = xpath(card)
+        if matches:
+            posted_time = matches[0].get('datetime', '')
+            if posted_time:
+                return posted_time
+    return ""
+
+# Per-field extractors, run in order; each sees the fields extracted before it
+LINKEDIN_FIELD_EXTRACTORS = {
+    'job_title': lambda card, fields: _first_text(card, LINKEDIN_FIELD_XPATHS['job_title']),
+    'company_name': lambda card, fields: _first_text(card, LINKEDIN_FIELD_XPATHS['company_name']),
+    'location': lambda card, fields: _first_text(card, LINKEDIN_FIELD_XPATHS['location']),
+    'job_link': _linkedin_job_link,
+    'posted_time': _linkedin_posted_time,
+}
+
+def find_linkedin_cards(root) -> List:
+    """Return card elements for the first card selector that matches"""
+    for xpath in LINKEDIN_CARD_XPATHS:
+        cards = xpath(root)
+        if cards:
+            return cards
+    return []
+
+def parse_linkedin_cards(page_source: str) -> List[Dict]:
+    """Parse every LinkedIn result card in a page snapshot into raw field dicts"""
+    root = _parse_html(page_source)
+    if root is None:
+        return []
+    
+    results = []
+    for card in find_linkedin_cards(root):
+        fields = {}
+        for field, extractor in LINKEDIN_FIELD_EXTRACTORS.items():
+            fields[field] = extractor(card, fields)
+        results.append(fields)
+    return results
+
+def pick_bayt_company_from_bold(bold_texts: List[str], job_title: str) -> Optional[str]:
+    """Pick the first bold text on a Bayt card that looks like a company name"""
+    for text in bold_texts:
+        text = text.strip()
+        if (text and text != job_title and 
+            'Easy Apply' not in text and 
+            'Saudi nationals' not in text and
+            'Mid career' not in text and
+            'Senior' not in text and
+            'Entry level' not in text):
+            return text
+    return None
+
+def pick_bayt_company_from_lines(lines: List[str], job_title: str) -> Optional[str]:
+    """Pick a company name from a Bayt card's text lines after the title"""
+    for line in lines[1:]:
+        line = line.strip()
+        if (line and line != job_title and 
+            not line.startswith('$') and 
+            not line.startswith('Yesterday') and 
+            not line.startswith('days ago') and 
+            'career' not in line.lower() and
+            'Easy Apply' not in line and
+            'Saudi nationals' not in line and
+            'Saudi Arabia' not in line and
+            not line.startswith('Seeking')):
+            return line
+    return None
+
+def parse_bayt_posted_time(posted_time_text: str) -> str:
+    """Convert Bayt's relative posting time into a YYYY-MM-DD date"""
+    posted_time = datetime.now().strftime("%Y-%m-%d")
+    if posted_time_text:
+        if "Yesterday" in posted_time_text:
+            posted_time = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        elif "days ago" in posted_time_text:
+            try:
+                days = int(posted_time_text.split()[0])
+                posted_time = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+            except Exception:
+                pass
+        elif "day ago" in posted_time_text:
+            posted_time = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    return posted_time
+
+def _bayt_title_link(card):
+    title_links = BAYT_FIELD_XPATHS['title_link'](card)
+    return title_links[0] if title_links else None
+
+def _bayt_job_link(card, fields: Dict) -> Optional[str]:
+    title_link = _bayt_title_link(card)
+    href = title_link.get('href') if title_link is not None else None
+    return urljoin("https://www.bayt.com", href) if href else None
+
+def _bayt_company_name(card, fields: Dict) -> Optional[str]:
+    # Same strategy order as the WebDriver path
+    job_title = fields['job_title']
+    return (_first_text(card, [BAYT_FIELD_XPATHS['company_link']]) or
+            _first_text(card, [BAYT_FIELD_XPATHS['company_bold']]) or
+            pick_bayt_company_from_bold(
+                [_element_text(elem) for elem in BAYT_FIELD_XPATHS['bold_text'](card)], job_title) or
+            pick_bayt_company_from_lines(
+                [line for line in (text.strip() for text in card.itertext()) if line], job_title))
+
+# Per-field extractors, run in order; each sees the fields extracted before it
+BAYT_FIELD_EXTRACTORS = {
+    'job_title': lambda card, fields: _element_text(_bayt_title_link(card)),
+    'job_link': _bayt_job_link,
+    'company_name': _bayt_company_name,
+    'location': lambda card, fields: _first_text(card, [BAYT_FIELD_XPATHS['location']]),
+    'salary': lambda card, fields: _first_text(card, [BAYT_FIELD_XPATHS['salary']]),
+    'description': lambda card, fields: _first_text(card, [BAYT_FIELD_XPATHS['description']]),
+    'career_level': lambda card, fields: _first_text(card, [BAYT_FIELD_XPATHS['career_level']]),
+    'posted_time': lambda card, fields: _first_text(card, [BAYT_FIELD_XPATHS['posted_time']]),
+}
+
+def find_bayt_cards(root) -> List:
+    return BAYT_CARD_XPATH(root)
+
+def parse_bayt_cards(page_source: str) -> List[Optional[Dict]]:
+    """Parse every Bayt result card in a page snapshot into raw field dicts"""
+    root = _parse_html(page_source)
+    if root is None:
+        return []
+    
+    results = []
+    for card in find_bayt_cards(root):
+        # Cards without a title link are skipped, as in the WebDriver path
+        if _bayt_title_link(card) is None:
+            results.append(None)
+            continue
+        fields = {}
+        for field, extractor in BAYT_FIELD_EXTRACTORS.items():
+            fields[field] = extractor(card, fields)
+        results.append(fields)
+    return results
+
+LINKEDIN_DETAIL_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{}"
+
+LINKEDIN_DETAIL_XPATHS = {
+    'description': [etree.XPath(f"//*[{_has_class('show-more-less-html__markup')}]"),
+                    etree.XPath(f"//*[{_has_class('description__text')}]")],
+    'criteria': etree.XPath(f"//*[{_has_class('description__job-criteria-item')}]"),
+    'criteria_header': etree.XPath(f".//*[{_has_class('description__job-criteria-subheader')}]"),
+    'criteria_value': etree.XPath(f".//*[{_has_class('description__job-criteria-text')}]"),
+    'top_card': [etree.XPath(f"//*[{_has_class('topcard__flavor-row')}]")],
+}
+WORKPLACE_TYPE_PATTERN = re.compile(r'\b(Remote|Hybrid|On-site)\b', re.IGNORECASE)
+
+def parse_linkedin_job_detail(page_source: str) -> Dict:
+    """Description, employment type and workplace type from a guest job-posting page"""
+    root = _parse_html(page_source)
+    if root is None:
+        return {}
+    criteria = {}
+    for item in LINKEDIN_DETAIL_XPATHS['criteria'](root):
+        header = _first_text(item, [LINKEDIN_DETAIL_XPATHS['criteria_header']]).lower()
+        value = _first_text(item, [LINKEDIN_DETAIL_XPATHS['criteria_value']])
+        if header and value:
+            criteria[header] = value
+    # The guest page lists workplace type as a criterion on some postings and in the top card on others
+    workplace_match = WORKPLACE_TYPE_PATTERN.search(
+        criteria.get('workplace type') or _first_text(root, LINKEDIN_DETAIL_XPATHS['top_card']))
+    return {
+        'description': _first_text(root, LINKEDIN_DETAIL_XPATHS['description']),
+        'employment_type': criteria.get('employment type', ''),
+        'workplace_type': workplace_match.group(1).capitalize() if workplace_match else '',
+    }
+
+class KeywordMatcher:
+    """Whole-word keyword matcher compiled once into a single trie-shaped regex"""
+    
+    SEPARATORS = re.compile(r'[\s\-_/]+')
+    ARABIC_DIACRITICS = re.compile(r'[\u064B-\u0652\u0640]')
+    ARABIC_ALEF = re.compile(r'[\u0622\u0623\u0625]')
+
+    def __init__(self, keywords: Dict[str, str], match_suffixes: bool = False):
+        """keywords maps each keyword to the label reported when it matches; match_suffixes
+        lets a keyword match the start of a longer word (e.g. plurals)"""
+        self.labels: Dict[str, str] = {}
+        for keyword, label in keywords.items():
+            normalized = self.normalize(keyword)
+            if normalized:
+                self.labels.setdefault(normalized, label)
+        
+        if self.labels:
+            trie: Dict = {}
+            for keyword in self.labels:
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[''] = True
+            # Factoring shared prefixes keeps matching cost flat as the keyword list grows
+            self.pattern = re.compile(r'(?<!\w)' + self._trie_pattern(trie) + ('' if match_suffixes else r'(?!\w)'))
+        else:
+            self.pattern = None
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """Lowercase, fold Arabic alef/diacritic variants and collapse separators to single spaces"""
+        text = cls.ARABIC_DIACRITICS.sub('', text.casefold())
+        text = cls.ARABIC_ALEF.sub('\u0627', text)
+        return cls.SEPARATORS.sub(' ', text).strip()
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict) -> str:
+        alternatives = [re.escape(char) + cls._trie_pattern(child)
+                        for char, child in sorted(node.items()) if char != '']
+        if not alternatives:
+            return ''
+        if len(alternatives) == 1 and '' not in node:
+            return alternatives[0]
+        group = '(?:' + '|'.join(alternatives) + ')'
+        return group + '?' if '' in node else group
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the label of the first keyword found in text, or None"""
+        if self.pattern is None or not text:
+            return None
+        match = self.pattern.search(self.normalize(text))
+        return self.labels[match.group(0)] if match else None
+
+    def matches(self, text: str) -> bool:
+        return self.search(text) is not None
+
+def load_keyword_file(path: str) -> List[str]:
+    """Read one keyword per line, skipping blank lines and # comments"""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+# Legal-form and filler words that differ between listings of the same employer
+COMPANY_STOPWORDS = {
+    'llc', 'co', 'company', 'ltd', 'limited', 'inc', 'corp', 'corporation', 'est', 'establishment',
+    'the', 'and', 'of', 'for', 'wll', 'spc', 'plc', 'ksa', 'sa', 'saudi', 'arabia',
+    'شركة', 'شركه', 'مؤسسة', 'مؤسسه', 'المحدودة', 'المحدوده', 'ذ.م.م', 'للتجارة', 'و',
+}
+# Work-arrangement and posting noise that does not change which job it is
+# Titles are compared as single-word tokens, so "on site" is covered by 'on' and 'site'
+TITLE_STOPWORDS = {'remote', 'hybrid', 'onsite', 'on', 'site', 'urgent', 'urgently', 'hiring', 'job', 'ksa', 'saudi', 'riyadh', 'jeddah', 'dammam'}
+# Country and region words shared by every location string
+LOCATION_STOPWORDS = {'saudi', 'arabia', 'ksa', 'sa', 'province', 'region', 'المملكة', 'العربية', 'السعودية'}
+# Arabic titles mapped to the English phrasing the other platform uses
+TITLE_SYNONYMS = {
+    'مصمم جرافيك': 'graphic designer',
+    'مصمم جرافيكس': 'graphic designer',
+    'مطور ويب': 'web developer',
+    'مطور تطبيقات': 'mobile developer',
+    'مصمم موشن جرافيك': 'motion graphic designer',
+}
+# Arabic company-name words mapped to the English wording the other platform lists; whole-name
+# aliases (e.g. "مصرف الراجحي": "al rajhi bank") come from dedupe.company_aliases in the config
+COMPANY_ALIASES = {
+    'التقنية': 'technology',
+    'تقنية': 'technology',
+    'للتقنية': 'technology',
+    'تقنيات': 'technologies',
+    'حلول': 'solutions',
+    'الحلول': 'solutions',
+    'مجموعة': 'group',
+    'المجموعة': 'group',
+    'الرقمية': 'digital',
+    'رقمية': 'digital',
+    'الاتصالات': 'telecom',
+    'للاتصالات': 'telecom',
+    'القابضة': 'holding',
+    'الإعلامية': 'media',
+    'للإعلام': 'media',
+    'الاستشارية': 'consulting',
+    'للاستشارات': 'consulting',
+    'التجارية': 'trading',
+}
+TOKEN_PATTERN = re.compile(r'[^\W_]+(?:\.[^\W_]+)*')
+
+def _tokens(text: str, stopwords: Set[str]) -> frozenset:
+    normalized = KeywordMatcher.normalize(text or '')
+    return frozenset(token for token in TOKEN_PATTERN.findall(normalized) if token not in stopwords)
+
+def _apply_aliases(text: str, aliases: Dict[str, str]) -> str:
+    """Replace each alias phrase with its canonical form, longest first so whole names win over words"""
+    normalized = f" {KeywordMatcher.normalize(text or '')} "
+    for alias in sorted(aliases, key=len, reverse=True):
+        normalized = normalized.replace(f" {KeywordMatcher.normalize(alias)} ", f" {aliases[alias]} ")
+    return normalized.strip()
+
+def normalize_company_name(name: str, aliases: Optional[Dict[str, str]] = None) -> frozenset:
+    """Company name as a token set without case, punctuation or legal suffixes like LLC/Co.,
+    with Arabic names and words mapped to their English form"""
+    return _tokens(_apply_aliases(name, {**COMPANY_ALIASES, **(aliases or {})}), COMPANY_STOPWORDS)
+
+def normalize_job_title(title: str) -> frozenset:
+    """Job title as a token set, with Arabic variants mapped to English and work-mode noise removed"""
+    normalized = KeywordMatcher.normalize(title or '')
+    for arabic, english in TITLE_SYNONYMS.items():
+        normalized = normalized.replace(KeywordMatcher.normalize(arabic), english)
+    return _tokens(normalized, TITLE_STOPWORDS)
+
+def _token_similarity(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two token sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def find_duplicate_groups(jobs: List[Job], threshold: float = 0.8, max_block_size: int = 200,
+                          company_aliases: Optional[Dict[str, str]] = None) -> List[List[int]]:
+    """Group indices of jobs that look like the same posting on different platforms, comparing only
+    jobs that share a company token. A group never holds two postings from the same platform."""
+    companies = [normalize_company_name(job.company_name, company_aliases) for job in jobs]
+    titles = [normalize_job_title(job.job_title) for job in jobs]
+    locations = [_tokens(job.location, LOCATION_STOPWORDS) for job in jobs]
+
+    # Blocking: inverted index from company token to jobs, so cost tracks block sizes rather than n^2
+    blocks: Dict[str, List[int]] = {}
+    for index, tokens in enumerate(companies):
+        for token in tokens:
+            blocks.setdefault(token, []).append(index)
+
+    parent = list(range(len(jobs)))
+    # Platforms already in each group, keyed by root; two postings on one platform are two jobs
+    group_platforms = [{job.platform} for job in jobs]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    compared = set()
+    for members in blocks.values():
+        # A token shared by very many companies is too common to identify one; other tokens still block those jobs
+        if len(members) < 2 or len(members) > max_block_size:
+            continue
+        for position, i in enumerate(members):
+            for j in members[position + 1:]:
+                if (i, j) in compared:
+                    continue
+                compared.add((i, j))
+                root_i, root_j = find(i), find(j)
+                if root_i == root_j or group_platforms[root_i] & group_platforms[root_j]:
+                    continue
+                # The same role in two different cities is two postings
+                if locations[i] and locations[j] and not locations[i] & locations[j]:
+                    continue
+                if (_token_similarity(companies[i], companies[j]) >= threshold
+                        and _token_similarity(titles[i], titles[j]) >= threshold):
+                    parent[root_j] = root_i
+                    group_platforms[root_i] |= group_platforms[root_j]
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(jobs)):
+        groups.setdefault(find(index), []).append(index)
+    return list(groups.values())
+
+MERGE_FILL_FIELDS = ('location', 'description_snippet', 'salary_info', 'career_level', 'description', 'employment_type')
+
+def merge_duplicate_jobs(jobs: List[Job], threshold: float = 0.8,
+                         company_aliases: Optional[Dict[str, str]] = None) -> List[Job]:
+    """Collapse near-duplicate postings into the first job of each group, keeping every source link"""
+    merged = []
+    for group in find_duplicate_groups(jobs, threshold, company_aliases=company_aliases):
+        keeper = jobs[group[0]]
+        links = list(keeper.source_links) or [keeper.job_link]
+        for index in group[1:]:
+            duplicate = jobs[index]
+            for link in duplicate.source_links or [duplicate.job_link]:
+                if link not in links:
+                    links.append(link)
+            # Fields only some platforms list (e.g. Bayt's salary) survive whichever posting is kept
+            for name in MERGE_FILL_FIELDS:
+                if not getattr(keeper, name):
+                    setattr(keeper, name, getattr(duplicate, name))
+        keeper.source_links = links
+        merged.append(keeper)
+    return merged
+
+# Registered platform scrapers, keyed by the lowercase name used in config and on the command line
+PLATFORM_SCRAPERS: Dict[str, type] = {}
+
+def register_platform(cls):
+    PLATFORM_SCRAPERS[cls.key] = cls
+    return cls
+
+class PlatformScraper:
+    """Interface for one job site. JobScraper runs each enabled platform in its own thread with its own
+    driver pool or HTTP session, so a failing platform does not take the others down."""
+
+    name = ""               # Display name stored on Job.platform, e.g. "LinkedIn"
+    key = ""                # Config / CLI name, e.g. "linkedin"
+    domain = ""             # Politeness bucket shared by every request to the site
+    rate_limits: Dict = {}  # Default AIMD settings for the domain's bucket
+    default_engine = "browser"
+
+    def __init__(self, scraper: 'JobScraper'):
+        self.scraper = scraper
+
+    @property
+    def engine(self) -> str:
+        """'browser' or 'http', from scraping.<key>_engine"""
+        return self.scraper.config.get('scraping', {}).get(f"{self.key}_engine", self.default_engine)
+
+    def work_items(self) -> List[str]:
+        """Roles this run still has to scrape"""
+        return self.scraper.pending_roles(self.name)
+
+    def scrape_role_browser(self, driver, role: str) -> List[Job]:
+        raise NotImplementedError
+
+    def scrape_role_http(self, session: requests.Session, role: str) -> List[Job]:
+        raise NotImplementedError
+
+    def scrape_page_http(self, session: requests.Session, role: str, page: int) -> List[Job]:
+        """One result page, 0-based; used by work-queue tasks"""
+        raise NotImplementedError
+
+    def extract_page(self, role: str, page: int, page_source: str) -> List[Job]:
+        """Jobs from an archived result page, through the same parsing and filtering as a live run"""
+        raise NotImplementedError
+
+    def detail_url(self, job: Job) -> Optional[str]:
+        """URL of the job's detail page for enrichment, or None if the platform has none worth fetching"""
+        return None
+
+    def parse_detail(self, page_source: str) -> Dict:
+        return {}
+
+@register_platform
+class LinkedInScraper(PlatformScraper):
+    name = "LinkedIn"
+    key = "linkedin"
+    domain = "linkedin.com"
+    rate_limits = {"initial_rate": 0.5, "min_rate": 0.05, "max_rate": 2.0}
+
+    def scrape_role_browser(self, driver, role: str) -> List[Job]:
+        return self.scraper.scrape_linkedin_role(driver, role)
+
+    def scrape_role_http(self, session: requests.Session, role: str) -> List[Job]:
+        return self.scraper.scrape_linkedin_role_http(session, role)
+
+    def scrape_page_http(self, session: requests.Session, role: str, page: int) -> List[Job]:
+        jobs, _ = self.scraper.scrape_linkedin_page_http(session, role, page * LINKEDIN_GUEST_PAGE_SIZE)
+        return jobs
+
+    def extract_page(self, role: str, page: int, page_source: str) -> List[Job]:
+        jobs, _ = self.scraper.extract_linkedin_page(role, page_source, page * LINKEDIN_GUEST_PAGE_SIZE)
+        return jobs
+
+    def detail_url(self, job: Job) -> Optional[str]:
+        job_key = job.get_dedupe_key()
+        if not job_key.startswith("linkedin:"):
+            return None
+        return LINKEDIN_DETAIL_URL.format(job_key.split(":", 1)[1])
+
+    def parse_detail(self, page_source: str) -> Dict:
+        return parse_linkedin_job_detail(page_source)
+
+@register_platform
+class BaytScraper(PlatformScraper):
+    name = "Bayt"
+    key = "bayt"
+    domain = "bayt.com"
+    rate_limits = {"initial_rate": 0.5, "min_rate": 0.05, "max_rate": 2.0}
+
+    def scrape_role_browser(self, driver, role: str) -> List[Job]:
+        return self.scraper.scrape_bayt_role(driver, role)
+
+    def scrape_role_http(self, session: requests.Session, role: str) -> List[Job]:
+        return self.scraper.scrape_bayt_role_http(session, role)
+
+    def scrape_page_http(self, session: requests.Session, role: str, page: int) -> List[Job]:
+        # Bayt pages are 1-based
+        jobs, _ = self.scraper.scrape_bayt_page_http(session, role, page + 1)
+        return jobs
+
+    def extract_page(self, role: str, page: int, page_source: str) -> List[Job]:
+        jobs, _ = self.scraper.extract_bayt_page(role, page_source)
+        return jobs
 
 class JobScraper:
     def __init__(self, config_file: str = "config.json"):
         self.config = self.load_config(config_file)
-        self.driver = None
+        # One pool per browser platform, so a crashing platform cannot starve the others
+        self.driver_pools: Dict[str, DriverPool] = {}
         self.seen_jobs: Set[str] = set()
+        self.seen_jobs_lock = threading.Lock()
+        self.extraction_mode = self.config.get('scraping', {}).get('extraction', 'webdriver')
+        self.platforms = [p.lower() for p in self.config.get('scraping', {}).get('platforms', ['linkedin', 'bayt'])]
+        # LinkedIn's f_TPR filter: only postings from the last N seconds
+        self.linkedin_time_window = self.config.get('scraping', {}).get('linkedin_time_window', 86400)
+        # Daemon mode keeps the driver pool warm between runs
+        self.keep_pool_warm = False
+        self.stop_requested = threading.Event()
+        self.resource_blocking = self.config.get('scraping', {}).get('resource_blocking', {})
+        # Restarts drivers after too many pages or too much renderer memory
+        watchdog_config = self.config.get('scraping', {}).get('watchdog', {})
+        self.driver_watchdog = DriverWatchdog(watchdog_config.get('max_pages', 100),
+                                              watchdog_config.get('max_heap_mb', 1024),
+                                              watchdog_config.get('max_dom_nodes', 150000))
+        # Stop paginating a LinkedIn role once a run of its cards was already collected by earlier runs
+        self.incremental = self.config.get('scraping', {}).get('incremental', {})
+        # Resource blocking needs the performance log for byte counts, network extraction for response bodies
+        self.capture_network = self.resource_blocking.get('enabled', False) or self.extraction_mode == 'network'
+        self.seen_store: Optional[SeenJobStore] = None
+        self.sync_cache: Optional[AirtableSyncCache] = None
+        self.checkpoint: Optional[RunCheckpoint] = None
+        self.sinks: List[BufferedSink] = []
+        # Set by --record; every fetched result page is saved for --replay
+        self.page_archive: Optional[PageArchive] = None
+        self.resumed_items: Set[Tuple[str, str]] = set()
+        self.metrics = RunMetrics()
         
         # Prioritize environment variables over config file
         self.api_key = os.getenv('AIRTABLE_API_KEY')
@@ -68,6 +2015,16 @@ class JobScraper:
         
         self.api_url = f"https://api.airtable.com/v0/{self.base_id}/{self.table_name}"
         
+        airtable_config = self.config.get('airtable', {})
+        self.politeness = self.build_politeness_scheduler()
+        self.airtable_writer = AirtableWriter(
+            self.api_key,
+            bucket=self.politeness.bucket("api.airtable.com"),
+            max_in_flight=airtable_config.get('max_in_flight', 3),
+            max_retries=airtable_config.get('max_retries', 5),
+            dead_letter_path=airtable_config.get('dead_letter_path', 'airtable_dead_letter.jsonl')
+        )
+        
         self.filtered_companies = {
             'large_companies': [
                 'google', 'microsoft', 'amazon', 'apple', 'meta', 'netflix', 'tesla',
@@ -88,7 +2045,23 @@ class JobScraper:
             'motion graphic designer', 'frontend developer', 'backend developer',
             'web developer', 'mobile developer', 'react developer', 'angular developer',"مصمم جرافيك"
         ]
+        self.build_matchers()
    
+    def build_politeness_scheduler(self) -> PolitenessScheduler:
+        """Per-domain AIMD buckets from scraping.politeness, seeded from older pacing settings when absent"""
+        scraping_config = self.config.get('scraping', {})
+        domain_config = {domain: dict(settings) for domain, settings in scraping_config.get('politeness', {}).items()}
+        # Configs from before adaptive pacing: start the scraped sites at 1/delay_between_requests
+        legacy_delay = scraping_config.get('delay_between_requests')
+        if legacy_delay:
+            for platform in PLATFORM_SCRAPERS.values():
+                domain_config.setdefault(platform.domain, {}).setdefault('initial_rate', 1 / legacy_delay)
+        requests_per_second = self.config.get('airtable', {}).get('requests_per_second')
+        if requests_per_second:
+            domain_config.setdefault("api.airtable.com", {}).setdefault('initial_rate', requests_per_second)
+        platform_limits = {platform.domain: platform.rate_limits for platform in PLATFORM_SCRAPERS.values()}
+        return PolitenessScheduler(domain_config, platform_limits)
+
     def load_config(self, config_file: str) -> Dict:
         """Load configuration from JSON file"""
         try:
@@ -115,35 +2088,129 @@ class JobScraper:
                 "api_key": "your_airtable_api_key_here",
                 "base_id": "your_airtable_base_id_here",
                 "table_name": "Jobs",
-                "script_runs_table_id": "your_script_runs_table_id_here"
+                "script_runs_table_id": "your_script_runs_table_id_here",
+                "upsert": True,
+                "max_in_flight": 3,
+                "max_retries": 5,
+                "dead_letter_path": "airtable_dead_letter.jsonl",
+                "stage_timings_field": None,
+                "source_links_field": None,
+                "description_field": None,
+                "employment_type_field": None
             },
             "slack": {
                 "webhook_url": "your_slack_webhook_url"
             },
+            "daemon": {
+                "health_check_minutes": 10,
+                "stagger_seconds": 120,
+                "platforms": {
+                    "linkedin": {"interval_minutes": 30, "linkedin_time_window": 3600},
+                    "bayt": {"interval_minutes": 180}
+                }
+            },
+            "queue": {
+                "path": "work_queue.db",
+                "staging_dir": "staging",
+                "lease_seconds": 900,
+                "max_attempts": 3,
+                "poll_seconds": 10
+            },
+            "metrics": {
+                "json_path": "scraper_metrics.json",
+                "prometheus_path": "scraper_metrics.prom"
+            },
+            "enrichment": {
+                "enabled": False,
+                "workers": 4,
+                "cache_path": "job_details.db",
+                "ttl_days": 14,
+                "snippet_length": 300
+            },
+            "export": {
+                "enabled": False,
+                "directory": "exports",
+                "formats": ["jsonl", "csv"]
+            },
+            "filters": {
+                "company_files": {},
+                "roles_file": None
+            },
+            "sinks": [
+                {"type": "airtable"},
+                {"type": "sqlite", "path": "jobs.db"}
+            ],
+            "sink_buffer": {
+                "batch_size": 1000,
+                "flush_seconds": 2
+            },
+            "dedupe": {
+                "path": "seen_jobs.db",
+                "ttl_days": 30,
+                "fuzzy": True,
+                "similarity_threshold": 0.8,
+                "company_aliases": {}
+            },
+            "checkpoint": {
+                "path": "scrape_checkpoint.db",
+                "max_age_hours": 12
+            },
             "scraping": {
                 "headless": True,
-                "delay_between_requests": 1,
-                "max_pages_per_site": 20
+                "max_pages_per_site": 20,
+                "workers": 2,
+                "platform_workers": {"linkedin": 2, "bayt": 1},
+                "http_workers": 4,
+                "extraction": "lxml",
+                "platforms": ["linkedin", "bayt"],
+                "bayt_engine": "http",
+                "linkedin_engine": "browser",
+                "linkedin_time_window": 86400,
+                "streaming": {
+                    "max_loads": 20
+                },
+                "watchdog": {
+                    "max_pages": 100,
+                    "max_heap_mb": 1024,
+                    "max_dom_nodes": 150000
+                },
+                "incremental": {
+                    "enabled": True,
+                    "consecutive_seen": 15
+                },
+                "politeness": {
+                    "linkedin.com": {"initial_rate": 0.5, "min_rate": 0.05, "max_rate": 2.0,
+                                     "increase": 0.05, "decrease": 0.5, "soft_decrease": 0.8},
+                    "bayt.com": {"initial_rate": 0.5, "min_rate": 0.05, "max_rate": 2.0},
+                    "api.airtable.com": {"initial_rate": 5.0, "min_rate": 0.5, "max_rate": 5.0}
+                },
+                "resource_blocking": {
+                    "enabled": True,
+                    "block": DEFAULT_BLOCKED_URL_PATTERNS,
+                    "platforms": {
+                        "linkedin": {"block": ["*linkedin.com/li/track*"], "allow": []},
+                        "bayt": {"block": ["*.css*"], "allow": []}
+                    }
+                },
+                "waits": {
+                    "timeout": 10,
+                    "poll_interval": 0.25,
+                    "dom_stable_ms": 500
+                }
             },
         }
         with open(config_file, 'w') as f:
             json.dump(template, f, indent=2)
         logger.info(f"Created template config file: {config_file}")
 
-    def setup_driver(self):
+    def setup_driver(self, worker_index: Optional[int] = None):
         """Setup Chrome driver with enhanced anti-detection and user agent rotation"""
         
-        # Updated user agents with more recent versions
-        user_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-        ]
-        
-        # Select random user agent
-        selected_user_agent = random.choice(user_agents)
+        # Pool workers rotate through the list so each browser keeps a distinct user agent
+        if worker_index is None:
+            selected_user_agent = random.choice(USER_AGENTS)
+        else:
+            selected_user_agent = USER_AGENTS[worker_index % len(USER_AGENTS)]
         logger.info(f"Using user agent: {selected_user_agent}")
         
         # Configure Chrome options
@@ -160,7 +2227,7 @@ class JobScraper:
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
@@ -185,6 +2252,18 @@ class JobScraper:
         chrome_options.add_argument("--aggressive-cache-discard")
         chrome_options.add_argument("--disable-background-networking")
         
+        # Lean profile: skip first-run, sync, component updates and audio
+        chrome_options.add_argument("--no-first-run")
+        chrome_options.add_argument("--disable-default-apps")
+        chrome_options.add_argument("--disable-sync")
+        chrome_options.add_argument("--disable-component-update")
+        chrome_options.add_argument("--mute-audio")
+        
+        # The performance log carries the Network events used to count blocked vs allowed bytes
+        if self.capture_network:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        
         # Additional prefs for better performance
         prefs = {
             "profile.default_content_setting_values": {
@@ -204,29 +2283,33 @@ class JobScraper:
         try:
             # Initialize driver
             logger.info("Initializing Chrome WebDriver...")
-            self.driver = webdriver.Chrome(options=chrome_options)
+            driver = webdriver.Chrome(options=chrome_options)
             
             # Set timeouts
-            self.driver.implicitly_wait(10)
-            self.driver.set_page_load_timeout(30)
+            driver.implicitly_wait(10)
+            driver.set_page_load_timeout(30)
+            
+            if self.capture_network:
+                # Network.setBlockedURLs and Network.getResponseBody need the Network domain enabled
+                driver.execute_cdp_cmd("Network.enable", {})
             
             # Execute anti-detection scripts
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             # Additional anti-detection measures
-            self.driver.execute_script("""
+            driver.execute_script("""
                 Object.defineProperty(navigator, 'plugins', {
                     get: () => [1, 2, 3, 4, 5]
                 });
             """)
             
-            self.driver.execute_script("""
+            driver.execute_script("""
                 Object.defineProperty(navigator, 'languages', {
                     get: () => ['en-US', 'en']
                 });
             """)
             
-            self.driver.execute_script("""
+            driver.execute_script("""
                 const getParameter = WebGLRenderingContext.getParameter;
                 WebGLRenderingContext.prototype.getParameter = function(parameter) {
                     if (parameter === 37445) {
@@ -245,581 +2328,1142 @@ class JobScraper:
             logger.error(f"Failed to initialize Chrome WebDriver: {e}")
             raise
         
-        return self.driver
+        return driver
    
-    def is_company_filtered(self, company_name: str) -> bool:
-        """Check if company should be filtered out"""
-        company_lower = company_name.lower()
+    def build_matchers(self):
+        """Compile the company blocklist, role list and job-type keywords into matchers"""
+        filters_config = self.config.get('filters', {})
         
+        company_keywords = {}
         for category, companies in self.filtered_companies.items():
-            for filtered_company in companies:
-                if filtered_company in company_lower:
-                    logger.info(f"Filtering out {company_name} - matches {category}")
-                    return True
+            for company in companies:
+                company_keywords[company] = category
+        for category, path in filters_config.get('company_files', {}).items():
+            for company in load_keyword_file(path):
+                company_keywords.setdefault(company, category)
+        self.company_matcher = KeywordMatcher(company_keywords)
+        
+        # Extra relevant roles only widen matching; they are not used as search terms
+        relevant_roles = list(self.target_roles)
+        if filters_config.get('roles_file'):
+            relevant_roles += load_keyword_file(filters_config['roles_file'])
+        self.role_matcher = KeywordMatcher({role: role for role in relevant_roles}, match_suffixes=True)
+        
+        self.remote_matcher = KeywordMatcher({keyword: "Remote" for keyword in
+                                              ['remote', 'work from home', 'wfh', 'telecommute', 'distributed']},
+                                             match_suffixes=True)
+        self.hybrid_matcher = KeywordMatcher({keyword: "Hybrid" for keyword in
+                                              ['hybrid', 'flexible', 'part remote', 'mixed']},
+                                             match_suffixes=True)
+        logger.info(f"Compiled matchers: {len(self.company_matcher.labels)} filtered companies, "
+                    f"{len(self.role_matcher.labels)} relevant roles")
+
+    def is_company_filtered(self, company_name: str) -> bool:
+        """Check if company should be filtered out"""
+        category = self.company_matcher.search(company_name)
+        if category:
+            logger.debug(f"Filtering out {company_name} - matches {category}")
+            return True
         return False
     
     def is_relevant_role(self, job_title: str) -> bool:
         """Check if job title matches target roles"""
-        title_lower = job_title.lower()
-        return any(role in title_lower for role in self.target_roles)
+        return self.role_matcher.matches(job_title)
     
     def determine_job_type(self, job_text: str) -> str:
         """Determine job type based on job description/title"""
-        text_lower = job_text.lower()
-        
-        remote_keywords = ['remote', 'work from home', 'wfh', 'telecommute', 'distributed']
-        hybrid_keywords = ['hybrid', 'flexible', 'part remote', 'mixed']
-        
-        if any(keyword in text_lower for keyword in remote_keywords):
+        if self.remote_matcher.matches(job_text):
             return "Remote"
-        elif any(keyword in text_lower for keyword in hybrid_keywords):
+        elif self.hybrid_matcher.matches(job_text):
             return "Hybrid"
         else:
             return "Offline"
-    
-    def load_more_linkedin_jobs(self, max_pages=5):
+
+    def mark_seen(self, job_hash: str) -> bool:
+        """Record a job hash, returning False if another worker already saw it"""
+        with self.seen_jobs_lock:
+            if job_hash in self.seen_jobs:
+                return False
+            self.seen_jobs.add(job_hash)
+            return True
+
+    def wait_until(self, condition, timeout: float) -> bool:
+        """Poll condition() until it returns truthy or the timeout expires"""
+        poll_interval = self.config.get('scraping', {}).get('waits', {}).get('poll_interval', 0.25)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if condition():
+                    return True
+            except Exception as e:
+                logger.debug(f"Wait condition raised: {e}")
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+    def count_cards(self, driver, selectors: List[str]) -> int:
+        """Count cards for the first selector that matches, in a single script round trip"""
+        return driver.execute_script("""
+            for (const selector of arguments[0]) {
+                const count = document.querySelectorAll(selector).length;
+                if (count > 0) return count;
+            }
+            return 0;
+        """, selectors)
+
+    def wait_for_card_growth(self, driver, selectors: List[str], previous_count: int,
+                             timeout: Optional[float] = None) -> int:
+        """Wait until the card count rises above previous_count, returning the latest count"""
+        if timeout is None:
+            timeout = self.config.get('scraping', {}).get('waits', {}).get('timeout', 10)
+        latest = {'count': previous_count}
+        
+        def grew():
+            latest['count'] = self.count_cards(driver, selectors)
+            return latest['count'] > previous_count
+        
+        self.wait_until(grew, timeout)
+        return latest['count']
+
+    def wait_for_dom_stable(self, driver, timeout: Optional[float] = None) -> bool:
+        """Wait until the DOM size and page height stop changing for dom_stable_ms"""
+        waits = self.config.get('scraping', {}).get('waits', {})
+        stable_seconds = waits.get('dom_stable_ms', 500) / 1000
+        if timeout is None:
+            timeout = waits.get('timeout', 10)
+        state = {'snapshot': None, 'since': time.monotonic()}
+        
+        def stable():
+            snapshot = driver.execute_script(
+                "return [document.getElementsByTagName('*').length, document.body.scrollHeight];")
+            now = time.monotonic()
+            if snapshot != state['snapshot']:
+                state['snapshot'] = snapshot
+                state['since'] = now
+                return False
+            return now - state['since'] >= stable_seconds
+        
+        return self.wait_until(stable, timeout)
+
+    def blocked_url_patterns(self, platform: str) -> List[str]:
+        """Shared plus per-platform block patterns, minus any the platform explicitly allows"""
+        platform_config = self.resource_blocking.get('platforms', {}).get(platform.lower(), {})
+        patterns = self.resource_blocking.get('block', DEFAULT_BLOCKED_URL_PATTERNS) + platform_config.get('block', [])
+        allowed = set(platform_config.get('allow', []))
+        return list(dict.fromkeys(pattern for pattern in patterns if pattern not in allowed))
+
+    def prepare_navigation(self, driver, platform: str):
+        """Point the driver's CDP block list at this platform before navigating. Each platform has its own
+        driver pool, but a queue worker's single driver switches between platforms from task to task."""
+        if not self.capture_network:
+            return
+        try:
+            if self.resource_blocking.get('enabled', False):
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_url_patterns(platform)})
+            # Drop events left over from the previous work item so the log covers one page
+            self.read_network_events(driver)
+        except Exception as e:
+            logger.warning(f"Could not prepare network capture for {platform}: {e}")
+
+    def read_network_events(self, driver) -> List[Dict]:
+        """Drain the performance log and return its Network.* events"""
+        events = []
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"]).get("message", {})
+            if message.get("method", "").startswith("Network."):
+                events.append(message)
+        return events
+
+    def log_network_usage(self, driver, platform: str, role: str, events: Optional[List[Dict]] = None):
+        """Log and count the allowed bytes and blocked requests of the page just scraped"""
+        if not self.capture_network:
+            return
+        try:
+            if events is None:
+                events = self.read_network_events(driver)
+            summary = summarize_network_events(events)
+        except Exception as e:
+            logger.debug(f"Could not read network log: {e}")
+            return
+        self.metrics.count("allowed_bytes", summary["allowed_bytes"], platform, role)
+        self.metrics.count("allowed_requests", summary["allowed_requests"], platform, role)
+        self.metrics.count("blocked_requests", summary["blocked_requests"], platform, role)
+        by_type = ", ".join(f"{resource_type} {size / 1024:.0f} KB" for resource_type, size in
+                            sorted(summary["bytes_by_type"].items(), key=lambda item: -item[1]))
+        logger.info(f"{platform} '{role}' network: {summary['allowed_requests']} requests / "
+                    f"{summary['allowed_bytes'] / 1024:.0f} KB allowed, {summary['blocked_requests']} blocked"
+                    + (f" ({by_type})" if by_type else ""))
+
+    def check_block_signal(self, domain: str, url: str, title: str) -> Optional[str]:
+        """Back the domain off hard if the page is a login wall or captcha, returning the signal"""
+        signal_name = detect_block_signal(url, title)
+        if signal_name:
+            self.politeness.backoff(domain, signal_name)
+        return signal_name
+
+    def record_page_outcome(self, domain: str, cards_found: int, first_page: bool = True):
+        """Feed a results page into the domain's AIMD rate: cards speed it up, an empty first page slows it"""
+        if cards_found:
+            self.politeness.success(domain)
+        elif first_page:
+            self.politeness.backoff(domain, "zero cards", soft=True)
+
+    def find_see_more_button(self, driver):
+        """Return the first visible, enabled 'See more jobs' button or None"""
+        return driver.execute_script("""
+            for (const selector of arguments[0]) {
+                let button = null;
+                try { button = document.querySelector(selector); } catch (e) { continue; }
+                if (button && !button.disabled && button.offsetParent !== null) return button;
+            }
+            return null;
+        """, LINKEDIN_SEE_MORE_SELECTORS)
+
+    def seen_run_tracker(self, role: str) -> Optional[SeenRunTracker]:
+        """Tracker for incremental pagination, or None when it is off or there is no seen store (workers)"""
+        if not self.incremental.get('enabled', False) or self.seen_store is None:
+            return None
+        return SeenRunTracker(self.seen_store, role, self.incremental.get('consecutive_seen', 15))
+
+    def linkedin_card_keys(self, driver) -> List[Optional[str]]:
+        """Dedupe keys of the cards on the page, in page order, read in one script round trip"""
+        references = driver.execute_script("""
+            for (const selector of arguments[0]) {
+                const cards = document.querySelectorAll(selector);
+                if (cards.length === 0) continue;
+                return Array.from(cards, card => {
+                    const urn = card.getAttribute('data-entity-urn') || card.getAttribute('data-job-id');
+                    if (urn) return urn;
+                    const inner = card.querySelector("[data-entity-urn], a[href*='/jobs/view/']");
+                    return inner ? (inner.getAttribute('data-entity-urn') || inner.href) : null;
+                });
+            }
+            return [];
+        """, LINKEDIN_CARD_SELECTORS)
+        return [linkedin_card_key(reference) for reference in references]
+
+    def reached_seen_cards(self, driver, tracker: Optional[SeenRunTracker]) -> bool:
+        """Feed cards loaded since the last check to the tracker, returning True once loading should stop"""
+        if tracker is None:
+            return False
+        if not tracker.stopped:
+            keys = self.linkedin_card_keys(driver)
+            if tracker.add(keys[tracker.checked:]):
+                self.log_early_stop(tracker)
+        return tracker.stopped
+
+    def log_early_stop(self, tracker: SeenRunTracker):
+        """Log and count a LinkedIn role whose pagination stopped at cards an earlier run collected"""
+        logger.info(f"Stopping early for role '{tracker.role}': {tracker.threshold} consecutive cards "
+                    f"were collected by an earlier run ({tracker.checked} cards checked)")
+        self.metrics.count("early_stops", 1, "LinkedIn", tracker.role)
+
+    def record_scanned_cards(self, role: str, card_fields: List[Optional[Dict]]):
+        """Remember the role's card IDs so the next run can stop once it reaches them"""
+        keys = [extract_native_job_id(fields.get('job_link')) for fields in card_fields if fields]
+        self.seen_store.record_scanned(role, [key for key in keys if key])
+
+    def scroll_until_plateau(self, driver, max_scrolls: int = 10,
+                             tracker: Optional[SeenRunTracker] = None) -> int:
+        """Scroll to the bottom until the card count stops growing, returning the final count"""
+        count = self.count_cards(driver, LINKEDIN_CARD_SELECTORS)
+        for scroll_attempt in range(max_scrolls):
+            if self.reached_seen_cards(driver, tracker):
+                break
+            logger.debug(f"Scroll attempt {scroll_attempt + 1}/{max_scrolls} ({count} cards)")
+            # Each scroll can fire a results request
+            self.politeness.wait("linkedin.com")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            new_count = self.wait_for_card_growth(driver, LINKEDIN_CARD_SELECTORS, count)
+            if new_count <= count:
+                logger.info(f"Card count plateaued at {count} after {scroll_attempt + 1} scroll(s)")
+                break
+            self.driver_watchdog.page_loaded(driver)
+            count = new_count
+        return count
+
+    def load_more_linkedin_jobs(self, driver, max_pages=5, tracker: Optional[SeenRunTracker] = None):
         """Load more jobs by clicking 'See more jobs' button"""
         for page in range(max_pages):
+            if self.reached_seen_cards(driver, tracker):
+                break
             try:
-                # Scroll to bottom first
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(3)
+                # Scroll to bottom first; infinite scroll may load more cards by itself
+                count = self.count_cards(driver, LINKEDIN_CARD_SELECTORS)
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 
                 # Look for "See more jobs" button
-                see_more_selectors = [
-                    "button[aria-label='See more jobs']",
-                    ".infinite-scroller__show-more-button",
-                    ".jobs-search-results__pagination button",
-                    "button:contains('See more jobs')"
-                ]
-                
-                button_clicked = False
-                for selector in see_more_selectors:
-                    try:
-                        button = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                        )
-                        button.click()
-                        button_clicked = True
-                        time.sleep(random.uniform(3, 7))
-                        break
-                    except:
+                button = self.find_see_more_button(driver)
+                if button is None:
+                    if self.wait_for_card_growth(driver, LINKEDIN_CARD_SELECTORS, count) > count:
+                        self.driver_watchdog.page_loaded(driver)
                         continue
-                
-                if not button_clicked:
                     logger.info(f"No more jobs to load at page {page + 1}")
                     break
+                
+                self.politeness.wait("linkedin.com")
+                try:
+                    button.click()
+                except Exception:
+                    driver.execute_script("arguments[0].click();", button)
+                
+                new_count = self.wait_for_card_growth(driver, LINKEDIN_CARD_SELECTORS, count)
+                if new_count <= count:
+                    logger.info(f"'See more jobs' added no cards at page {page + 1}")
+                    break
+                self.driver_watchdog.page_loaded(driver)
+                logger.debug(f"Loaded {new_count - count} more cards at page {page + 1}")
                     
             except Exception as e:
                 logger.error(f"Error loading more jobs: {e}")
                 break
 
+    def harvest_linkedin_cards(self, driver) -> str:
+        """Return the outer HTML of cards not harvested yet and remove them from the DOM.
+        The newest card stays behind as the scroll anchor, so infinite scroll keeps working."""
+        return driver.execute_script("""
+            for (const selector of arguments[0]) {
+                const cards = Array.from(document.querySelectorAll(selector));
+                if (cards.length === 0) continue;
+                const html = cards.filter(card => !card.hasAttribute('data-scraper-harvested'))
+                                  .map(card => card.outerHTML).join('');
+                const anchor = cards[cards.length - 1];
+                anchor.setAttribute('data-scraper-harvested', '');
+                for (const card of cards) {
+                    if (card !== anchor) (card.closest('li') || card).remove();
+                }
+                return html;
+            }
+            return '';
+        """, LINKEDIN_CARD_SELECTORS)
+
+    def load_next_linkedin_chunk(self, driver) -> bool:
+        """Scroll, then click 'See more jobs' if scrolling alone loaded nothing; True if new cards arrived"""
+        count = self.count_cards(driver, LINKEDIN_CARD_SELECTORS)
+        self.politeness.wait("linkedin.com")
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        loaded = self.wait_for_card_growth(driver, LINKEDIN_CARD_SELECTORS, count) > count
+        if not loaded:
+            button = self.find_see_more_button(driver)
+            if button is None:
+                return False
+            self.politeness.wait("linkedin.com")
+            try:
+                button.click()
+            except Exception:
+                driver.execute_script("arguments[0].click();", button)
+            loaded = self.wait_for_card_growth(driver, LINKEDIN_CARD_SELECTORS, count) > count
+        if loaded:
+            self.driver_watchdog.page_loaded(driver)
+        return loaded
+
+    def stream_linkedin_cards(self, driver, role: str, tracker: Optional[SeenRunTracker] = None) -> List[Dict]:
+        """Load results chunk by chunk, parsing each batch of new cards and pruning it from the DOM,
+        so Chrome's memory and every DOM query stay flat however many results the role has"""
+        max_loads = self.config.get('scraping', {}).get('streaming', {}).get('max_loads', 20)
+        card_fields = []
+        chunks = []
+        for load in range(max_loads + 1):
+            with self.metrics.stage("extraction", "LinkedIn", role):
+                chunk = self.harvest_linkedin_cards(driver)
+                chunk_fields = parse_linkedin_cards(chunk) if chunk else []
+            card_fields.extend(chunk_fields)
+            if self.page_archive:
+                chunks.append(chunk)
+            logger.debug(f"Harvested {len(chunk_fields)} cards for role '{role}' ({len(card_fields)} so far)")
+            
+            if tracker and tracker.add([extract_native_job_id(fields.get('job_link')) for fields in chunk_fields]):
+                self.log_early_stop(tracker)
+                break
+            if self.driver_watchdog.over_memory(driver):
+                # Keep what was harvested, but fail the work item so the rest of the role is scraped again
+                # on resume; the pool restarts this driver before its next role
+                logger.warning(f"Renderer above its memory limits, stopping role '{role}' after {len(card_fields)} cards; "
+                               f"it will be retried")
+                self.metrics.count("memory_stops", 1, "LinkedIn", role)
+                self.metrics.count("role_failures", 1, "LinkedIn", role)
+                break
+            if load == max_loads:
+                break
+            with self.metrics.stage("scrolling", "LinkedIn", role):
+                if not self.load_next_linkedin_chunk(driver):
+                    break
+        
+        if self.page_archive:
+            self.archive_page("LinkedIn", role, 0, ''.join(chunks))
+        return card_fields
+
+    def get_platform_scrapers(self, platforms: List[str]) -> List[PlatformScraper]:
+        """Instantiate the registered scrapers for the given platform names, skipping unknown ones"""
+        scrapers = []
+        for key in platforms:
+            if key in PLATFORM_SCRAPERS:
+                scrapers.append(PLATFORM_SCRAPERS[key](self))
+            else:
+                logger.warning(f"Unknown platform '{key}', skipping (available: {', '.join(PLATFORM_SCRAPERS)})")
+        return scrapers
+
+    def get_driver_pool(self, platform: PlatformScraper) -> DriverPool:
+        """The platform's driver pool, started on first use and kept while the pool stays warm"""
+        if platform.key not in self.driver_pools:
+            scraping_config = self.config.get('scraping', {})
+            workers = scraping_config.get('platform_workers', {}).get(platform.key, scraping_config.get('workers', 1))
+            self.driver_pools[platform.key] = DriverPool(self.setup_driver, workers, self.driver_watchdog).start()
+        return self.driver_pools[platform.key]
+
+    def close_driver_pools(self):
+        for pool in self.driver_pools.values():
+            pool.close()
+        self.driver_pools = {}
+
+    def scrape_platform(self, platform: PlatformScraper) -> List[Job]:
+        """Scrape every pending role of one platform with its own driver pool or HTTP session"""
+        roles = platform.work_items()
+        if not roles:
+            return []
+        logger.info(f"Starting {platform.name} scraping ({platform.engine} engine, {len(roles)} roles)...")
+        jobs = []
+        if platform.engine == 'http':
+            http_workers = self.config.get('scraping', {}).get('http_workers', 4)
+            session = self.create_http_session(http_workers)
+            try:
+                with ThreadPoolExecutor(max_workers=http_workers) as executor:
+                    for role_jobs in executor.map(
+                            lambda role: self.scrape_checkpointed(
+                                platform.name, role, lambda: platform.scrape_role_http(session, role)),
+                            roles):
+                        jobs.extend(role_jobs)
+            finally:
+                session.close()
+        else:
+            pool = self.get_driver_pool(platform)
+            
+            def run_role(role):
+                with pool.acquire() as driver:
+                    return self.scrape_checkpointed(platform.name, role, lambda: platform.scrape_role_browser(driver, role))
+            
+            with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                # map() keeps results in role order so merged output stays deterministic
+                for role_jobs in executor.map(run_role, roles):
+                    jobs.extend(role_jobs)
+        
+        logger.info(f"{platform.name} scraping completed. Jobs extracted: {len(jobs)}")
+        return jobs
+
+    def pending_roles(self, platform: str) -> List[str]:
+        """Target roles whose work item for this platform has not been checkpointed as completed"""
+        return [role for role in self.target_roles if (platform, role) not in self.resumed_items]
+
+    def scrape_checkpointed(self, platform: str, role: str, scrape) -> List[Job]:
+        """Run one work item and checkpoint its jobs, marking it failed if the role scraper hit an error"""
+        # After a shutdown request, unstarted items are left for the next run
+        if self.stop_requested.is_set():
+            return []
+        failures_before = self.metrics.value("role_failures", platform, role)
+        jobs = scrape()
+        if self.checkpoint:
+            # A throttled or blocked fetch counts as a failure too, so the role is scraped again on resume
+            failed = self.metrics.value("role_failures", platform, role) > failures_before
+            if failed:
+                logger.warning(f"{platform} role '{role}' failed; checkpointed for retry with {len(jobs)} job(s)")
+            self.checkpoint.save(platform, role, jobs, status="failed" if failed else "completed")
+        self.stream_to_sinks(jobs)
+        return jobs
+
+    def stream_to_sinks(self, jobs: List[Job]):
+        """Hand a finished work item's jobs to the local sinks right away; new-only sinks wait for the run's dedupe"""
+        for sink in self.sinks:
+            if not sink.sink.new_only:
+                sink.submit(jobs)
+
     def scrape_linkedin(self) -> List[Job]:
         """Scrape LinkedIn jobs for Saudi Arabia"""
-        logger.info("Starting LinkedIn scraping...")
+        return self.scrape_platform(LinkedInScraper(self))
+
+    def fetch_linkedin_guest_page(self, session: requests.Session, role: str, start: int = 0) -> Optional[str]:
+        """Fetch one guest job-search HTML fragment starting at the given result offset,
+        returning "" past the last result and None when the request failed or was throttled or blocked"""
+        url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+        params = {
+            "keywords": role,
+            "location": "Saudi Arabia",
+            "f_TPR": f"r{self.linkedin_time_window}",
+            # Most recent first: the incremental early stop relies on older cards coming last
+            "sortBy": "DD",
+            "start": start,
+        }
+        
+        try:
+            response = session.get(url, params=params, timeout=30)
+        except requests.RequestException as e:
+            logger.error(f"Error fetching LinkedIn results at start={start} for role '{role}': {e}")
+            return None
+        
+        # LinkedIn answers 400 once start runs past the last result
+        if response.status_code == 400:
+            return ""
+        if response.status_code in THROTTLE_STATUS_CODES:
+            self.politeness.backoff("linkedin.com", f"HTTP {response.status_code}")
+        elif response.status_code == 200 and self.check_block_signal("linkedin.com", response.url,
+                                                                     html_title(response.text)):
+            return None
+        if response.status_code != 200:
+            logger.error(f"Failed to fetch LinkedIn results at start={start} for role '{role}': {response.status_code}")
+            return None
+        return response.text
+
+    def scrape_linkedin_role_http(self, session: requests.Session, role: str) -> List[Job]:
+        """Scrape up to max_pages_per_site guest result fragments for a single LinkedIn role"""
         jobs = []
-        total_cards_found = 0
-        total_jobs_processed = 0
+        cards_processed = 0
+        max_pages = self.config.get('scraping', {}).get('max_pages_per_site', 1)
         
         try:
-            # LinkedIn job search URL for Saudi Arabia
-            base_url = "https://www.linkedin.com/jobs/search/?keywords={}&location=Saudi%20Arabia&f_TPR=r86400"
+            start = 0
+            tracker = self.seen_run_tracker(role)
+            for page in range(max_pages):
+                page_jobs, cards_found = self.scrape_linkedin_page_http(session, role, start, tracker)
+                if not cards_found:
+                    break
+                jobs.extend(page_jobs)
+                cards_processed += cards_found
+                start += cards_found
+                if tracker and tracker.stopped:
+                    self.log_early_stop(tracker)
+                    break
+            if tracker:
+                # Recorded only now, so this run's own earlier pages never count as seen
+                self.seen_store.record_scanned(role, tracker.keys)
             
-            for role_index, role in enumerate(self.target_roles):
-                logger.info(f"Scraping role {role_index + 1}/{len(self.target_roles)}: '{role}'")
-                url = base_url.format(role.replace(' ', '%20'))
-                logger.info(f"Navigating to URL: {url}")
-                
-                self.driver.get(url)
-                
-                # Wait for page to load completely
-                time.sleep(random.uniform(3, 7))
-                
-                # Scroll and load more jobs
-                logger.info("Scrolling to load more jobs...")
-                for scroll_attempt in range(10):
-                    logger.debug(f"Scroll attempt {scroll_attempt + 1}/3")
-                    self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(random.uniform(3, 7))
-                
-                # Wait for dynamic content to load
-                time.sleep(random.uniform(3, 7))
-                
-                self.load_more_linkedin_jobs(max_pages=10)  
-                # Extract job cards
-                logger.info("Extracting job cards...")
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, ".job-search-card")
-                cards_found = len(job_cards)
-                total_cards_found += cards_found
-                logger.info(f"Found {cards_found} job cards for role '{role}'")
-                
-                if cards_found == 0:
-                    logger.warning(f"No job cards found for role '{role}'. Trying alternative selectors...")
-                    # Try alternative selectors
-                    alternative_selectors = [
-                        ".base-search-card",
-                        ".jobs-search-results__list-item",
-                        ".job-result-card",
-                        ".jobs-search__results-list li",
-                        "[data-job-id]",
-                        "[data-entity-urn*='jobPosting']"
-                    ]
-                    
-                    for selector in alternative_selectors:
-                        alt_cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if alt_cards:
-                            logger.info(f"Found {len(alt_cards)} cards with alternative selector: {selector}")
-                            job_cards = alt_cards
-                            cards_found = len(job_cards)
-                            break
-                    
-                    if cards_found == 0:
-                        continue
-                
-                # Process job cards (limit to first 20 per role)
-                # cards_to_process = min(20, cards_found)
-                cards_to_process = cards_found
-                logger.info(f"Processing {cards_to_process} job cards...")
-                
-                for card_index, card in enumerate(job_cards[:cards_to_process]):
-                    total_jobs_processed += 1
-                    logger.debug(f"Processing card {card_index + 1}/{cards_to_process} for role '{role}'")
-                    
-                    try:
-                        # Wait for element to be visible
-                        time.sleep(random.uniform(3, 7))
-                        
-                        # Extract job title with multiple approaches
-                        job_title = ""
-                        title_selectors = [
-                            ".base-search-card__title",
-                            "h3",
-                            ".sr-only"
-                        ]
-                        
-                        for selector in title_selectors:
-                            try:
-                                title_elem = card.find_element(By.CSS_SELECTOR, selector)
-                                job_title = title_elem.text.strip()
-                                if job_title:
-                                    break
-                                # Try innerHTML if text is empty
-                                job_title = title_elem.get_attribute('innerHTML').strip()
-                                if job_title:
-                                    # Clean HTML tags
-                                    import re
-                                    job_title = re.sub(r'<[^>]+>', '', job_title).strip()
-                                    break
-                            except NoSuchElementException:
-                                continue
-                        
-                        # Extract company name
-                        company_name = ""
-                        company_selectors = [
-                            ".base-search-card__subtitle a",
-                            ".base-search-card__subtitle",
-                            "h4 a",
-                            "h4"
-                        ]
-                        
-                        for selector in company_selectors:
-                            try:
-                                company_elem = card.find_element(By.CSS_SELECTOR, selector)
-                                company_name = company_elem.text.strip()
-                                if company_name:
-                                    break
-                                # Try innerHTML if text is empty
-                                company_name = company_elem.get_attribute('innerHTML').strip()
-                                if company_name:
-                                    import re
-                                    company_name = re.sub(r'<[^>]+>', '', company_name).strip()
-                                    break
-                            except NoSuchElementException:
-                                continue
-                        
-                        # Extract location
-                        location = ""
-                        location_selectors = [
-                            ".job-search-card__location",
-                            ".job-result-card__location"
-                        ]
-                        
-                        for selector in location_selectors:
-                            try:
-                                location_elem = card.find_element(By.CSS_SELECTOR, selector)
-                                location = location_elem.text.strip()
-                                if location:
-                                    break
-                                # Try innerHTML if text is empty
-                                location = location_elem.get_attribute('innerHTML').strip()
-                                if location:
-                                    import re
-                                    location = re.sub(r'<[^>]+>', '', location).strip()
-                                    break
-                            except NoSuchElementException:
-                                continue
-                        
-                        # Extract job link
-                        job_link = ""
-                        link_selectors = [
-                            ".base-card__full-link",
-                            "a[href*='/jobs/view/']",
-                            "a"
-                        ]
-                        
-                        for selector in link_selectors:
-                            try:
-                                link_elem = card.find_element(By.CSS_SELECTOR, selector)
-                                job_link = link_elem.get_attribute("href")
-                                if job_link and '/jobs/view/' in job_link:
-                                    job_link = job_link.split('?')[0]
-                                    break
-                            except NoSuchElementException:
-                                continue
-                        
-                        # Extract posting time
-                        posted_time = ""
-                        time_selectors = [
-                            ".job-search-card__listdate--new",
-                            "time",
-                            "[datetime]"
-                        ]
-                        
-                        for selector in time_selectors:
-                            try:
-                                time_elem = card.find_element(By.CSS_SELECTOR, selector)
-                                posted_time = time_elem.get_attribute("datetime")
-                                if posted_time:
-                                    break
-                            except NoSuchElementException:
-                                continue
-                        
-                        if not posted_time:
-                            posted_time = datetime.now().strftime("%Y-%m-%d")
-                        
-                        # Log extracted data for debugging
-                        logger.debug(f"Extracted data:")
-                        logger.debug(f"  Title: '{job_title}'")
-                        logger.debug(f"  Company: '{company_name}'")
-                        logger.debug(f"  Location: '{location}'")
-                        logger.debug(f"  Link: '{job_link}'")
-                        logger.debug(f"  Posted: '{posted_time}'")
-                        
-                        # Validate extracted data
-                        if not job_title:
-                            logger.warning(f"Card {card_index + 1}: Empty job title, skipping")
-                            continue
-                        if not company_name:
-                            logger.warning(f"Card {card_index + 1}: Empty company name, skipping")
-                            continue
-                        if not job_link:
-                            logger.warning(f"Card {card_index + 1}: Empty job link, skipping")
-                            continue
-                        
-                        # Apply filters
-                        # if not self.is_relevant_role(job_title):
-                        #     logger.info(f"Skipping irrelevant role: '{job_title}'")
-                        #     continue
-                        
-                        if self.is_company_filtered(company_name):
-                            logger.info(f"Skipping filtered company: '{company_name}'")
+            self.metrics.count("jobs_extracted", len(jobs), "LinkedIn", role)
+            logger.info(f"LinkedIn role '{role}' completed. Cards processed: {cards_processed}, Jobs extracted: {len(jobs)}")
+        except Exception as e:
+            logger.error(f"LinkedIn scraping failed for role '{role}': {e}")
+            self.metrics.count("role_failures", 1, "LinkedIn", role)
+        
+        return jobs
+
+    def scrape_linkedin_page_http(self, session: requests.Session, role: str, start: int,
+                                  tracker: Optional[SeenRunTracker] = None) -> Tuple[List[Job], int]:
+        """Fetch, parse and filter one guest result fragment, returning its jobs and card count (0 at the end)"""
+        self.politeness.wait("linkedin.com")
+        with self.metrics.stage("http_fetch", "LinkedIn", role):
+            fragment = self.fetch_linkedin_guest_page(session, role, start)
+        if fragment is None:
+            # Throttled, blocked or failed: the role is retried rather than treated as finished
+            self.metrics.count("role_failures", 1, "LinkedIn", role)
+            return [], 0
+        if not fragment:
+            return [], 0
+        self.archive_page("LinkedIn", role, start // LINKEDIN_GUEST_PAGE_SIZE, fragment)
+        
+        jobs, card_fields = self.extract_linkedin_page(role, fragment, start)
+        # Later pages run dry naturally; an empty first page is a soft sign of throttling
+        self.record_page_outcome("linkedin.com", len(card_fields), first_page=start == 0)
+        logger.info(f"Found {len(card_fields)} job cards for role '{role}' (start={start})")
+        if tracker:
+            tracker.add([extract_native_job_id(fields.get('job_link')) for fields in card_fields])
+        return jobs, len(card_fields)
+
+    def extract_linkedin_page(self, role: str, page_source: str, start: int = 0) -> Tuple[List[Job], List[Dict]]:
+        """Parse and filter one LinkedIn results page or guest fragment, returning its jobs and raw card fields"""
+        jobs = []
+        with self.metrics.stage("extraction", "LinkedIn", role):
+            card_fields = parse_linkedin_cards(page_source)
+        self.metrics.count("cards_found", len(card_fields), "LinkedIn", role)
+        
+        with self.metrics.stage("filtering", "LinkedIn", role):
+            for card_index, fields in enumerate(card_fields, start):
+                try:
+                    job = self.build_linkedin_job(fields, card_index)
+                    if job:
+                        jobs.append(job)
+                except Exception as e:
+                    logger.error(f"Card {card_index + 1}: Error processing - {e}")
+                    continue
+        return jobs, card_fields
+
+    def scrape_linkedin_role(self, driver, role: str) -> List[Job]:
+        """Scrape LinkedIn jobs for a single target role on the given driver"""
+        jobs = []
+        cards_processed = 0
+        
+        try:
+            # LinkedIn job search URL for Saudi Arabia
+            # sortBy=DD lists the most recent first, which the incremental early stop relies on
+            base_url = "https://www.linkedin.com/jobs/search/?keywords={}&location=Saudi%20Arabia&f_TPR=r{}&sortBy=DD"
+            
+            logger.info(f"Scraping LinkedIn role: '{role}'")
+            url = base_url.format(role.replace(' ', '%20'), self.linkedin_time_window)
+            logger.info(f"Navigating to URL: {url}")
+            
+            self.prepare_navigation(driver, "LinkedIn")
+            self.politeness.wait("linkedin.com")
+            with self.metrics.stage("navigation", "LinkedIn", role):
+                driver.get(url)
+                # Wait until the first cards render
+                self.wait_for_card_growth(driver, LINKEDIN_CARD_SELECTORS, 0)
+            self.driver_watchdog.page_loaded(driver)
+            if self.check_block_signal("linkedin.com", driver.current_url, driver.title):
+                self.metrics.count("role_failures", 1, "LinkedIn", role)
+                return jobs
+            
+            tracker = self.seen_run_tracker(role)
+            network_events = None
+            if self.extraction_mode == 'streaming':
+                card_fields = self.stream_linkedin_cards(driver, role, tracker)
+            else:
+                # Scroll and load more jobs
+                logger.info("Scrolling to load more jobs...")
+                with self.metrics.stage("scrolling", "LinkedIn", role):
+                    self.scroll_until_plateau(driver, max_scrolls=10, tracker=tracker)
+                
+                with self.metrics.stage("see_more", "LinkedIn", role):
+                    self.load_more_linkedin_jobs(driver, max_pages=10, tracker=tracker)
+                    # Wait for dynamic content to settle before reading cards
+                    self.wait_for_dom_stable(driver)
+                if self.page_archive:
+                    self.archive_page("LinkedIn", role, 0, driver.page_source)
+                
+                # Extract job cards
+                logger.info("Extracting job cards...")
+                with self.metrics.stage("extraction", "LinkedIn", role):
+                    card_fields = None
+                    if self.extraction_mode == 'network':
+                        # Parse the result responses the page fetched, falling back to the DOM below
+                        network_events = self.read_network_events(driver)
+                        card_fields = self.extract_linkedin_cards_network(driver, network_events)
+                    if card_fields is None:
+                        if self.extraction_mode in ('lxml', 'network'):
+                            # One page_source snapshot, parsed in-process
+                            card_fields = parse_linkedin_cards(driver.page_source)
+                        else:
+                            card_fields = self.extract_linkedin_cards_webdriver(driver, role)
+                # Sampled at the page's largest, for the pool's recycle decision
+                self.driver_watchdog.sample(driver)
+            cards_found = len(card_fields)
+            self.metrics.count("cards_found", cards_found, "LinkedIn", role)
+            self.record_page_outcome("linkedin.com", cards_found)
+            self.log_network_usage(driver, "LinkedIn", role, network_events)
+            logger.info(f"Found {cards_found} job cards for role '{role}'")
+            
+            with self.metrics.stage("filtering", "LinkedIn", role):
+                for card_index, fields in enumerate(card_fields):
+                    cards_processed += 1
+                    try:
+                        if fields is None:
                             continue
-                        
-                        # Determine job type
-                        job_type = self.determine_job_type(f"{job_title} {location}")
-                        
-                        # Create job object
-                        job = Job(
-                            company_name=company_name,
-                            platform="LinkedIn",
-                            job_title=job_title,
-                            job_type=job_type,
-                            job_link=job_link,
-                            posted_time=posted_time,
-                            location=location or "Saudi Arabia"
-                        )
-                        
-                        # Check for duplicates
-                        job_hash = job.get_hash()
-                        
-                        # if job_hash not in self.seen_jobs:
-                        jobs.append(job)
-                        #     self.seen_jobs.add(job_hash)
-                        #     logger.info(f"✓ Added job: '{job_title}' at '{company_name}' ({job_type})")
-                        # else:
-                        #     logger.info(f"Duplicate job found: '{job_title}' at '{company_name}'")
-                            
+                        job = self.build_linkedin_job(fields, card_index)
+                        if job:
+                            jobs.append(job)
                     except Exception as e:
                         logger.error(f"Card {card_index + 1}: Error processing - {e}")
                         continue
-                
-                # Add delay between roles
-                delay = self.config.get('scraping', {}).get('delay_between_requests', 2)
-                logger.debug(f"Waiting {delay} seconds before next role...")
-                time.sleep(delay)
-                
-            logger.info(f"LinkedIn scraping completed. Cards found: {total_cards_found}, Cards processed: {total_jobs_processed}, Jobs extracted: {len(jobs)}")
+            self.metrics.count("jobs_extracted", len(jobs), "LinkedIn", role)
+            if tracker:
+                self.record_scanned_cards(role, card_fields)
+            
+            logger.info(f"LinkedIn role '{role}' completed. Cards processed: {cards_processed}, Jobs extracted: {len(jobs)}")
             
         except Exception as e:
-            logger.error(f"LinkedIn scraping failed: {e}")
+            logger.error(f"LinkedIn scraping failed for role '{role}': {e}")
+            self.metrics.count("role_failures", 1, "LinkedIn", role)
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
         
         return jobs
+
+    def extract_linkedin_cards_network(self, driver, events: List[Dict]) -> Optional[List[Dict]]:
+        """Parse cards from the search page and seeMoreJobPostings responses in the performance log.
+        Returns None when the responses are missing or hold fewer cards than the DOM, so the caller falls back"""
+        finished = {event["params"].get("requestId") for event in events if event.get("method") == "Network.loadingFinished"}
+        request_ids = []
+        for event in events:
+            if event.get("method") != "Network.responseReceived":
+                continue
+            params = event.get("params", {})
+            response = params.get("response", {})
+            if (response.get("status") == 200 and LINKEDIN_RESULTS_URL_PATTERN.search(response.get("url", ""))
+                    and params.get("requestId") in finished):
+                request_ids.append(params["requestId"])
+        
+        card_fields = []
+        for request_id in request_ids:
+            try:
+                body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            except Exception as e:
+                # Chrome evicts bodies it no longer buffers
+                logger.debug(f"Response body {request_id} unavailable: {e}")
+                continue
+            text = base64.b64decode(body["body"]).decode('utf-8', 'replace') if body.get("base64Encoded") else body["body"]
+            card_fields.extend(parse_linkedin_cards(text))
+        
+        dom_count = self.count_cards(driver, LINKEDIN_CARD_SELECTORS)
+        if not card_fields or len(card_fields) < dom_count:
+            logger.info(f"Network capture found {len(card_fields)} cards from {len(request_ids)} response(s) "
+                        f"but the page shows {dom_count}; falling back to the DOM")
+            return None
+        logger.info(f"Parsed {len(card_fields)} cards from {len(request_ids)} captured response(s)")
+        return card_fields
+
+    def extract_linkedin_cards_webdriver(self, driver, role: str) -> List[Optional[Dict]]:
+        """Extract LinkedIn card fields element by element through WebDriver"""
+        job_cards = driver.find_elements(By.CSS_SELECTOR, LINKEDIN_CARD_SELECTORS[0])
+        
+        if not job_cards:
+            logger.warning(f"No job cards found for role '{role}'. Trying alternative selectors...")
+            # Try alternative selectors
+            for selector in LINKEDIN_CARD_SELECTORS[1:]:
+                alt_cards = driver.find_elements(By.CSS_SELECTOR, selector)
+                if alt_cards:
+                    logger.info(f"Found {len(alt_cards)} cards with alternative selector: {selector}")
+                    job_cards = alt_cards
+                    break
+        
+        card_fields = []
+        for card_index, card in enumerate(job_cards):
+            logger.debug(f"Processing card {card_index + 1}/{len(job_cards)} for role '{role}'")
+            try:
+                card_fields.append(self.extract_linkedin_card_fields(card))
+            except Exception as e:
+                logger.error(f"Card {card_index + 1}: Error processing - {e}")
+                card_fields.append(None)
+        return card_fields
+
+    def extract_linkedin_card_fields(self, card) -> Dict:
+        """Read one LinkedIn card's fields, trying each fallback selector in order"""
+        
+        def first_text(selectors):
+            for selector in selectors:
+                try:
+                    elem = card.find_element(By.CSS_SELECTOR, selector)
+                    value = elem.text.strip()
+                    if value:
+                        return value
+                    # Try innerHTML if text is empty
+                    value = re.sub(r'<[^>]+>', '', elem.get_attribute('innerHTML')).strip()
+                    if value:
+                        return value
+                except NoSuchElementException:
+                    continue
+            return ""
+        
+        job_link = ""
+        for selector in LINKEDIN_FIELD_SELECTORS['job_link']:
+            try:
+                link_elem = card.find_element(By.CSS_SELECTOR, selector)
+                job_link = link_elem.get_attribute("href")
+                if job_link and '/jobs/view/' in job_link:
+                    job_link = job_link.split('?')[0]
+                    break
+            except NoSuchElementException:
+                continue
+        
+        posted_time = ""
+        for selector in LINKEDIN_FIELD_SELECTORS['posted_time']:
+            try:
+                time_elem = card.find_element(By.CSS_SELECTOR, selector)
+                posted_time = time_elem.get_attribute("datetime")
+                if posted_time:
+                    break
+            except NoSuchElementException:
+                continue
+        
+        return {
+            'job_title': first_text(LINKEDIN_FIELD_SELECTORS['job_title']),
+            'company_name': first_text(LINKEDIN_FIELD_SELECTORS['company_name']),
+            'location': first_text(LINKEDIN_FIELD_SELECTORS['location']),
+            'job_link': job_link or "",
+            'posted_time': posted_time or "",
+        }
+
+    def build_linkedin_job(self, fields: Dict, card_index: int) -> Optional[Job]:
+        """Validate and filter extracted LinkedIn card fields, returning a Job or None"""
+        job_title = fields['job_title']
+        company_name = fields['company_name']
+        location = fields['location']
+        job_link = fields['job_link']
+        posted_time = fields['posted_time'] or datetime.now().strftime("%Y-%m-%d")
+        
+        # Log extracted data for debugging
+        logger.debug(f"Extracted data:")
+        logger.debug(f"  Title: '{job_title}'")
+        logger.debug(f"  Company: '{company_name}'")
+        logger.debug(f"  Location: '{location}'")
+        logger.debug(f"  Link: '{job_link}'")
+        logger.debug(f"  Posted: '{posted_time}'")
+        
+        # Validate extracted data
+        if not job_title:
+            logger.warning(f"Card {card_index + 1}: Empty job title, skipping")
+            return None
+        if not company_name:
+            logger.warning(f"Card {card_index + 1}: Empty company name, skipping")
+            return None
+        if not job_link:
+            logger.warning(f"Card {card_index + 1}: Empty job link, skipping")
+            return None
+        
+        # Apply filters
+        # if not self.is_relevant_role(job_title):
+        #     logger.info(f"Skipping irrelevant role: '{job_title}'")
+        #     return None
+        
+        if self.is_company_filtered(company_name):
+            logger.info(f"Skipping filtered company: '{company_name}'")
+            return None
+        
+        # Determine job type
+        job_type = self.determine_job_type(f"{job_title} {location}")
+        
+        # Create job object
+        job = Job(
+            company_name=company_name,
+            platform="LinkedIn",
+            job_title=job_title,
+            job_type=job_type,
+            job_link=job_link,
+            posted_time=posted_time,
+            location=location or "Saudi Arabia"
+        )
+        
+        # Check for duplicates; native IDs keep distinct postings with the same title apart
+        if not self.mark_seen(job.get_dedupe_key()):
+            logger.info(f"Duplicate job found: '{job_title}' at '{company_name}'")
+            return None
+        logger.info(f"✓ Added job: '{job_title}' at '{company_name}' ({job_type})")
+        return job
  
     def scrape_bayt(self) -> List[Job]:
         """Scrape Bayt jobs for Saudi Arabia with correct selectors"""
-        logger.info("Starting Bayt scraping...")
+        return self.scrape_platform(BaytScraper(self))
+
+    def create_http_session(self, pool_size: int) -> requests.Session:
+        """Create a pooled requests session with retries for browserless scraping"""
+        session = requests.Session()
+        # Throttle statuses (429, 503, ...) are left to the politeness scheduler, which slows the whole domain down
+        retry = Retry(total=3, backoff_factor=1,
+                      status_forcelist=sorted({500, 502, 503, 504} - THROTTLE_STATUS_CODES),
+                      allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": random.choice(USER_AGENTS),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        return session
+
+    def fetch_bayt_page(self, session: requests.Session, role: str, page: int = 1) -> Optional[str]:
+        """Fetch one server-rendered Bayt results page, returning its HTML or None on failure"""
+        formatted_role = role.replace(' ', '-').lower()
+        url = f"https://www.bayt.com/en/saudi-arabia/jobs/{formatted_role}-jobs/"
+        params = {"date": 1}
+        if page > 1:
+            params["page"] = page
+        
+        try:
+            response = session.get(url, params=params, timeout=30)
+        except requests.RequestException as e:
+            logger.error(f"Error fetching Bayt page {page} for role {role}: {e}")
+            return None
+        
+        if response.status_code in THROTTLE_STATUS_CODES:
+            self.politeness.backoff("bayt.com", f"HTTP {response.status_code}")
+        if response.status_code != 200:
+            logger.error(f"Failed to fetch Bayt page {page} for role {role}: {response.status_code}")
+            return None
+        if self.check_block_signal("bayt.com", response.url, html_title(response.text)):
+            return None
+        return response.text
+
+    def scrape_bayt_role_http(self, session: requests.Session, role: str) -> List[Job]:
+        """Scrape up to max_pages_per_site Bayt result pages for a single role over HTTP"""
         jobs = []
+        max_pages = self.config.get('scraping', {}).get('max_pages_per_site', 1)
         
         try:
-            base_url = "https://www.bayt.com/en/saudi-arabia/jobs/{}-jobs/?date=1"
-            
+            for page in range(1, max_pages + 1):
+                page_jobs, cards_found = self.scrape_bayt_page_http(session, role, page)
+                if not cards_found:
+                    break
+                jobs.extend(page_jobs)
+        except Exception as e:
+            logger.error(f"Error scraping role {role}: {e}")
+            self.metrics.count("role_failures", 1, "Bayt", role)
+        
+        self.metrics.count("jobs_extracted", len(jobs), "Bayt", role)
+        logger.info(f"Bayt role '{role}' completed. Found {len(jobs)} jobs.")
+        return jobs
 
-            for role in self.target_roles:
-                formatted_role = role.replace(' ', '-').lower()
-                url = base_url.format(formatted_role)
-            
-                logger.info(f"Scraping Bayt for role: {role} - URL: {url}")
-            
+    def scrape_bayt_page_http(self, session: requests.Session, role: str, page: int) -> Tuple[List[Job], int]:
+        """Fetch, parse and filter one Bayt result page, returning its jobs and card count (0 at the end)"""
+        self.politeness.wait("bayt.com")
+        with self.metrics.stage("http_fetch", "Bayt", role):
+            page_source = self.fetch_bayt_page(session, role, page)
+        if page_source is None:
+            # Throttled, blocked or failed: the role is retried rather than treated as finished
+            self.metrics.count("role_failures", 1, "Bayt", role)
+            return [], 0
+        if not page_source:
+            return [], 0
+        self.archive_page("Bayt", role, page - 1, page_source)
+        
+        jobs, cards_found = self.extract_bayt_page(role, page_source)
+        self.record_page_outcome("bayt.com", cards_found, first_page=page == 1)
+        logger.info(f"Found {cards_found} job cards for role: {role} (page {page})")
+        return jobs, cards_found
+
+    def extract_bayt_page(self, role: str, page_source: str) -> Tuple[List[Job], int]:
+        """Parse and filter one Bayt results page, returning its jobs and card count"""
+        jobs = []
+        with self.metrics.stage("extraction", "Bayt", role):
+            card_fields = parse_bayt_cards(page_source)
+        self.metrics.count("cards_found", len(card_fields), "Bayt", role)
+        
+        with self.metrics.stage("filtering", "Bayt", role):
+            for i, fields in enumerate(card_fields):
                 try:
-                    self.driver.get(url)
-                    
-                    # Wait for page to load completely
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, "body"))
-                    )
-                    
-                    # Additional wait for dynamic content
-                    time.sleep(random.uniform(3, 7))
-                    
-                    # Log page title to verify page loaded
-                    page_title = self.driver.title
-                    logger.info(f"Page loaded: {page_title}")
-                    
-                    # Find job cards using the correct selector
-                    job_cards = self.driver.find_elements(By.CSS_SELECTOR, ".has-pointer-d")
-                    logger.info(f"Found {len(job_cards)} job cards")
-                    
-                    if not job_cards:
-                        logger.warning(f"No job cards found for role: {role}")
+                    if fields is None:
                         continue
-                    
-                    # Process job cards
-                    for i, card in enumerate(job_cards):
-                        try:
-                            logger.info(f"Processing job card {i+1}/{len(job_cards)}")
-                            
-                            # Extract job title and link from h2 > a
-                            job_title = None
-                            job_link = None
-                            try:
-                                title_elem = card.find_element(By.CSS_SELECTOR, "h2 a")
-                                job_title = title_elem.text.strip()
-                                job_link = title_elem.get_attribute("href")
-                                if job_link:
-                                    job_link = job_link.split('?')[0]
-                            except Exception as e:
-                                logger.warning(f"Could not extract job title from card {i+1}: {e}")
-                                continue
-                            
-                            # Extract company name from the company link
-                            company_name = None
-                            try:
-                                # Strategy 1: Look for a.t-default.t-bold (original selector)
-                                company_elem = card.find_element(By.CSS_SELECTOR, "a.t-default.t-bold")
-                                company_name = company_elem.text.strip()
-                                logger.info(f"Found company name using a.t-default.t-bold: {company_name}")
-                            except Exception as e:
-                                logger.warning(f"Strategy 1 failed for card {i+1}: {e}")
-                                try:
-                                    # Strategy 2: Look for <b> tag in the job-company-location-wrapper
-                                    company_elem = card.find_element(By.CSS_SELECTOR, ".job-company-location-wrapper b")
-                                    company_name = company_elem.text.strip()
-                                    logger.info(f"Found company name using <b> tag: {company_name}")
-                                except Exception as e:
-                                    logger.warning(f"Strategy 2 failed for card {i+1}: {e}")
-                                    
-                                    # Strategy 3: Look for any bold text that might be company name
-                                    try:
-                                        bold_elems = card.find_elements(By.CSS_SELECTOR, "b, .t-bold")
-                                        for elem in bold_elems:
-                                            text = elem.text.strip()
-                                            if (text and text != job_title and 
-                                                'Easy Apply' not in text and 
-                                                'Saudi nationals' not in text and
-                                                'Mid career' not in text and
-                                                'Senior' not in text and
-                                                'Entry level' not in text):
-                                                company_name = text
-                                                logger.info(f"Found company name using fallback bold text: {company_name}")
-                                                break
-                                    except Exception as e:
-                                        logger.warning(f"Strategy 3 failed for card {i+1}: {e}")
-                                        
-                                        # Strategy 4: Parse from card text structure
-                                        try:
-                                            card_text = card.text
-                                            lines = card_text.split('\n')
-                                            # Look for company name in the lines after job title
-                                            for line in lines[1:]:
-                                                line = line.strip()
-                                                if (line and line != job_title and 
-                                                    not line.startswith('$') and 
-                                                    not line.startswith('Yesterday') and 
-                                                    not line.startswith('days ago') and 
-                                                    'career' not in line.lower() and
-                                                    'Easy Apply' not in line and
-                                                    'Saudi nationals' not in line and
-                                                    'Saudi Arabia' not in line and
-                                                    not line.startswith('Seeking')):
-                                                    company_name = line
-                                                    logger.info(f"Found company name using text parsing: {company_name}")
-                                                    break
-                                        except Exception as e:
-                                            logger.warning(f"Strategy 4 failed for card {i+1}: {e}")
-
-                            # Final validation
-                            if not company_name:
-                                logger.warning(f"No company name found for card {i+1} - Title: {job_title}")
-                                company_name = "Unknown Company"
-                            else:
-                                logger.info(f"Successfully extracted company name: {company_name}")
-                            
-                            # Extract location from the div with class "t-mute t-small"
-                            location = "Saudi Arabia"
-                            try:
-                                location_elem = card.find_element(By.CSS_SELECTOR, "div.t-mute.t-small")
-                                location_text = location_elem.text.strip()
-                                if location_text:
-                                    # Extract the city name (before the ·)
-                                    location_parts = location_text.split('·')
-                                    if len(location_parts) >= 2:
-                                        city = location_parts[0].strip()
-                                        country = location_parts[1].strip()
-                                        location = f"{city}, {country}"
-                                    else:
-                                        location = location_text
-                            except Exception as e:
-                                logger.warning(f"Could not extract location from card {i+1}: {e}")
-                            
-                            # Extract salary if available
-                            salary_info = None
-                            try:
-                                salary_elem = card.find_element(By.CSS_SELECTOR, "dt.jb-label-salary")
-                                salary_text = salary_elem.text.strip()
-                                if salary_text:
-                                    # Remove the icon and extract just the salary range
-                                    salary_parts = salary_text.split('$')
-                                    if len(salary_parts) > 1:
-                                        salary_info = '$' + '$'.join(salary_parts[1:])
-                                        logger.info(f"Found salary info: {salary_info}")
-                            except Exception:
-                                pass
-                            
-                            # Extract job description
-                            description = None
-                            try:
-                                desc_elem = card.find_element(By.CSS_SELECTOR, "div.jb-descr")
-                                description = desc_elem.text.strip()
-                            except Exception:
-                                pass
-                            
-                            # Extract career level
-                            career_level = None
-                            try:
-                                career_elem = card.find_element(By.CSS_SELECTOR, "dt.jb-label-careerlevel")
-                                career_level = career_elem.text.strip()
-                                if career_level:
-                                    # Remove the icon text
-                                    career_parts = career_level.split()
-                                    if len(career_parts) >= 2:
-                                        career_level = ' '.join(career_parts[1:])  # Skip the first part (icon)
-                            except Exception:
-                                pass
-                            
-                            # Extract posted time
-                            posted_time = datetime.now().strftime("%Y-%m-%d")
-                            try:
-                                date_elem = card.find_element(By.CSS_SELECTOR, "span[data-automation-id='job-active-date']")
-                                posted_time_text = date_elem.text.strip()
-                                if posted_time_text:
-                                    # Convert relative time to actual date
-                                    if "Yesterday" in posted_time_text:
-                                        posted_time = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-                                    elif "days ago" in posted_time_text:
-                                        try:
-                                            days = int(posted_time_text.split()[0])
-                                            posted_time = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-                                        except Exception:
-                                            pass
-                                    elif "day ago" in posted_time_text:
-                                        posted_time = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-                            except Exception:
-                                pass
-                            
-                            # Validate extracted data
-                            if not job_title:
-                                logger.warning(f"No job title found for card {i+1}")
-                                continue
-                            
-                            # Apply filters
-                            if not self.is_relevant_role(job_title):
-                                logger.info(f"Skipping irrelevant role: {job_title}")
-                                continue
-                                
-                            if self.is_company_filtered(company_name):
-                                logger.info(f"Skipping filtered company: {company_name}")
-                                continue
-                            
-                            # Determine job type
-                            job_type = self.determine_job_type(f"{job_title} {description or ''}")
-                            
-                            # Create job object
-                            job = Job(
-                                company_name=company_name,
-                                platform="Bayt",
-                                job_title=job_title,
-                                job_type=job_type,
-                                job_link=job_link,
-                                posted_time=posted_time,
-                                location=location
-                            )
-                            
-                            if salary_info:
-                                job.salary_info = salary_info
-                            if career_level:
-                                job.career_level = career_level
-                            if description:
-                                job.description = description
-                            
-                            job_hash = job.get_hash()
-                            if job_hash not in self.seen_jobs:
-                                jobs.append(job)
-                                self.seen_jobs.add(job_hash)
-                                logger.info(f"Successfully extracted job: {job_title} at {company_name}")
-                            else:
-                                logger.info(f"Duplicate job found: {job_title} at {company_name}")
-                        
-                        except Exception as e:
-                            logger.warning(f"Error extracting job card {i+1}: {e}")
-                            continue
-                    
-                    # Add delay between requests
-                    time.sleep(self.config.get('scraping', {}).get('delay_between_requests', 2))
-                    
-                except TimeoutException:
-                    logger.error(f"Timeout loading page for role: {role}")
-                    continue
+                    job = self.build_bayt_job(fields, i)
+                    if job and self.mark_seen(job.get_dedupe_key()):
+                        jobs.append(job)
                 except Exception as e:
-                    logger.error(f"Error scraping role {role}: {e}")
+                    logger.warning(f"Error extracting job card {i+1}: {e}")
                     continue
+        return jobs, len(card_fields)
+
+    def scrape_bayt_role(self, driver, role: str) -> List[Job]:
+        """Scrape Bayt jobs for a single target role on the given driver"""
+        jobs = []
+        base_url = "https://www.bayt.com/en/saudi-arabia/jobs/{}-jobs/?date=1"
+        
+        formatted_role = role.replace(' ', '-').lower()
+        url = base_url.format(formatted_role)
     
+        logger.info(f"Scraping Bayt for role: {role} - URL: {url}")
+    
+        try:
+            self.prepare_navigation(driver, "Bayt")
+            self.politeness.wait("bayt.com")
+            with self.metrics.stage("navigation", "Bayt", role):
+                driver.get(url)
+                
+                # Wait for page to load completely
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+                
+                # Wait for the job cards rather than a fixed delay
+                self.wait_for_card_growth(driver, [".has-pointer-d"], 0)
+            self.driver_watchdog.page_loaded(driver)
+            if self.check_block_signal("bayt.com", driver.current_url, driver.title):
+                self.metrics.count("role_failures", 1, "Bayt", role)
+                return jobs
+            
+            # Log page title to verify page loaded
+            page_title = driver.title
+            logger.info(f"Page loaded: {page_title}")
+            
+            if self.page_archive:
+                self.archive_page("Bayt", role, 0, driver.page_source)
+            
+            # Find job cards using the correct selector
+            with self.metrics.stage("extraction", "Bayt", role):
+                # Bayt renders results server-side, so network and streaming modes read the page like lxml
+                if self.extraction_mode in ('lxml', 'network', 'streaming'):
+                    card_fields = parse_bayt_cards(driver.page_source)
+                else:
+                    job_cards = driver.find_elements(By.CSS_SELECTOR, ".has-pointer-d")
+                    card_fields = [self.extract_bayt_card_fields(card, i) for i, card in enumerate(job_cards)]
+            self.metrics.count("cards_found", len(card_fields), "Bayt", role)
+            self.record_page_outcome("bayt.com", len(card_fields))
+            self.log_network_usage(driver, "Bayt", role)
+            logger.info(f"Found {len(card_fields)} job cards")
+            
+            if not card_fields:
+                logger.warning(f"No job cards found for role: {role}")
+                return jobs
+            
+            # Process job cards
+            with self.metrics.stage("filtering", "Bayt", role):
+                for i, fields in enumerate(card_fields):
+                    try:
+                        logger.info(f"Processing job card {i+1}/{len(card_fields)}")
+                        if fields is None:
+                            continue
+                        job = self.build_bayt_job(fields, i)
+                        if not job:
+                            continue
+                        
+                        if self.mark_seen(job.get_dedupe_key()):
+                            jobs.append(job)
+                            logger.info(f"Successfully extracted job: {job.job_title} at {job.company_name}")
+                        else:
+                            logger.info(f"Duplicate job found: {job.job_title} at {job.company_name}")
+                    
+                    except Exception as e:
+                        logger.warning(f"Error extracting job card {i+1}: {e}")
+                        continue
+            
+        except TimeoutException:
+            logger.error(f"Timeout loading page for role: {role}")
+            self.metrics.count("role_failures", 1, "Bayt", role)
         except Exception as e:
-            logger.error(f"Bayt scraping failed: {e}")
+            logger.error(f"Error scraping role {role}: {e}")
+            self.metrics.count("role_failures", 1, "Bayt", role)
         
-        logger.info(f"Bayt scraping completed. Found {len(jobs)} jobs.")
+        self.metrics.count("jobs_extracted", len(jobs), "Bayt", role)
+        logger.info(f"Bayt role '{role}' completed. Found {len(jobs)} jobs.")
         return jobs
+
+    def extract_bayt_card_fields(self, card, i: int) -> Optional[Dict]:
+        """Read one Bayt card's raw fields element by element through WebDriver"""
+        # Extract job title and link from h2 > a
+        try:
+            title_elem = card.find_element(By.CSS_SELECTOR, "h2 a")
+            job_title = title_elem.text.strip()
+            job_link = title_elem.get_attribute("href")
+        except Exception as e:
+            logger.warning(f"Could not extract job title from card {i+1}: {e}")
+            return None
+        
+        # Extract company name from the company link
+        company_name = None
+        try:
+            # Strategy 1: Look for a.t-default.t-bold (original selector)
+            company_elem = card.find_element(By.CSS_SELECTOR, "a.t-default.t-bold")
+            company_name = company_elem.text.strip()
+            logger.info(f"Found company name using a.t-default.t-bold: {company_name}")
+        except Exception as e:
+            logger.warning(f"Strategy 1 failed for card {i+1}: {e}")
+            try:
+                # Strategy 2: Look for <b> tag in the job-company-location-wrapper
+                company_elem = card.find_element(By.CSS_SELECTOR, ".job-company-location-wrapper b")
+                company_name = company_elem.text.strip()
+                logger.info(f"Found company name using <b> tag: {company_name}")
+            except Exception as e:
+                logger.warning(f"Strategy 2 failed for card {i+1}: {e}")
+                
+                # Strategy 3: Look for any bold text that might be company name
+                try:
+                    bold_texts = [elem.text for elem in card.find_elements(By.CSS_SELECTOR, "b, .t-bold")]
+                    company_name = pick_bayt_company_from_bold(bold_texts, job_title)
+                    if company_name:
+                        logger.info(f"Found company name using fallback bold text: {company_name}")
+                except Exception as e:
+                    logger.warning(f"Strategy 3 failed for card {i+1}: {e}")
+                    
+                    # Strategy 4: Parse from card text structure
+                    try:
+                        company_name = pick_bayt_company_from_lines(card.text.split('\n'), job_title)
+                        if company_name:
+                            logger.info(f"Found company name using text parsing: {company_name}")
+                    except Exception as e:
+                        logger.warning(f"Strategy 4 failed for card {i+1}: {e}")
+        
+        def optional_text(selector):
+            try:
+                return card.find_element(By.CSS_SELECTOR, selector).text.strip()
+            except Exception:
+                return ""
+        
+        return {
+            'job_title': job_title,
+            'job_link': job_link,
+            'company_name': company_name,
+            'location': optional_text("div.t-mute.t-small"),
+            'salary': optional_text("dt.jb-label-salary"),
+            'description': optional_text("div.jb-descr"),
+            'career_level': optional_text("dt.jb-label-careerlevel"),
+            'posted_time': optional_text("span[data-automation-id='job-active-date']"),
+        }
+
+    def build_bayt_job(self, fields: Dict, i: int) -> Optional[Job]:
+        """Normalize, validate and filter raw Bayt card fields, returning a Job or None"""
+        job_title = fields['job_title']
+        job_link = fields['job_link']
+        if job_link:
+            job_link = job_link.split('?')[0]
+        
+        # Final validation
+        company_name = fields['company_name']
+        if not company_name:
+            logger.warning(f"No company name found for card {i+1} - Title: {job_title}")
+            company_name = "Unknown Company"
+        else:
+            logger.info(f"Successfully extracted company name: {company_name}")
+        
+        # Extract location from the div with class "t-mute t-small"
+        location = "Saudi Arabia"
+        location_text = fields['location']
+        if location_text:
+            # Extract the city name (before the ·)
+            location_parts = location_text.split('·')
+            if len(location_parts) >= 2:
+                city = location_parts[0].strip()
+                country = location_parts[1].strip()
+                location = f"{city}, {country}"
+            else:
+                location = location_text
+        
+        # Extract salary if available
+        salary_info = None
+        salary_text = fields['salary']
+        if salary_text:
+            # Remove the icon and extract just the salary range
+            salary_parts = salary_text.split('$')
+            if len(salary_parts) > 1:
+                salary_info = '$' + '$'.join(salary_parts[1:])
+                logger.info(f"Found salary info: {salary_info}")
+        
+        # Extract job description
+        description = fields['description'] or None
+        
+        # Extract career level
+        career_level = fields['career_level'] or None
+        if career_level:
+            # Remove the icon text
+            career_parts = career_level.split()
+            if len(career_parts) >= 2:
+                career_level = ' '.join(career_parts[1:])  # Skip the first part (icon)
+        
+        # Extract posted time
+        posted_time = parse_bayt_posted_time(fields['posted_time'])
+        
+        # Validate extracted data
+        if not job_title:
+            logger.warning(f"No job title found for card {i+1}")
+            return None
+        
+        # Apply filters
+        if not self.is_relevant_role(job_title):
+            logger.info(f"Skipping irrelevant role: {job_title}")
+            return None
+            
+        if self.is_company_filtered(company_name):
+            logger.info(f"Skipping filtered company: {company_name}")
+            return None
+        
+        # Determine job type
+        job_type = self.determine_job_type(f"{job_title} {description or ''}")
+        
+        # Create job object
+        job = Job(
+            company_name=company_name,
+            platform="Bayt",
+            job_title=job_title,
+            job_type=job_type,
+            job_link=job_link,
+            posted_time=posted_time,
+            location=location,
+            salary_info=salary_info,
+            career_level=career_level,
+            description=description or None
+        )
+        return job
     
     def log_script_run(self, total_jobs: int, linkedin_jobs: int, indeed_jobs: int,
                        bayt_jobs: int, remote_jobs: int, hybrid_jobs: int,
@@ -827,13 +3471,7 @@ class JobScraper:
         """Log script run statistics to Airtable script runs table"""
         try:
             # Use the script runs table ID from the documentation
-            base_id = self.config['airtable']['base_id']
-            script_runs_url = f"https://api.airtable.com/v0/{base_id}/{self.script_runs_table_id}"
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            script_runs_url = f"https://api.airtable.com/v0/{self.base_id}/{self.script_runs_table_id}"
             
             # Prepare the record data using field IDs (more reliable than field names)
             record = {
@@ -851,31 +3489,41 @@ class JobScraper:
                 }
             }
             
+            # Optional long-text field holding per-stage seconds, e.g. {"navigation": 812.4, ...}
+            stage_timings_field = self.config.get('airtable', {}).get('stage_timings_field')
+            if stage_timings_field:
+                record["fields"][stage_timings_field] = json.dumps(self.metrics.stage_totals())
+            
             payload = {"records": [record]}
             
-            response = requests.post(script_runs_url, headers=headers, data=json.dumps(payload))
+            response = self.airtable_writer.request("POST", script_runs_url, payload)
             
-            if response.status_code == 200:
+            if response is not None and response.status_code == 200:
                 logger.info(f"Successfully logged script run to Airtable: {total_jobs} jobs found")
                 return True
             else:
-                logger.error(f"Failed to log script run: {response.status_code}, {response.text}")
+                status = response.status_code if response is not None else None
+                logger.error(f"Failed to log script run: {status}, {response.text if response is not None else ''}")
                 return False
                 
         except Exception as e:
             logger.error(f"Error while logging script run: {e}")
             return False
 
-    def save_to_airtable(self, jobs: List[Job]):
-        """Save jobs to Airtable in batches"""
+    def save_to_airtable(self, jobs: List[Job]) -> List[Job]:
+        """Save jobs to Airtable in batches, returning the jobs that were saved"""
+        saved_jobs = []
+        upsert = self.config.get('airtable', {}).get('upsert', False)
+        # Optional long-text field listing every platform link of a merged job
+        source_links_field = self.config.get('airtable', {}).get('source_links_field')
+        # Optional fields filled by the enrichment stage
+        description_field = self.config.get('airtable', {}).get('description_field')
+        employment_type_field = self.config.get('airtable', {}).get('employment_type_field')
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             # Prepare job data to send to Airtable
             records = []
+            record_jobs = []
+            unchanged_records = []
             for job in jobs:
                 record = {
                     "fields": {
@@ -889,73 +3537,656 @@ class JobScraper:
                         "Scraped At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     }
                 }
+                if source_links_field and len(job.source_links) > 1:
+                    record["fields"][source_links_field] = "\n".join(job.source_links)
+                if description_field and job.description_snippet:
+                    record["fields"][description_field] = job.description_snippet
+                if employment_type_field and job.employment_type:
+                    record["fields"][employment_type_field] = job.employment_type
+                # Records identical to the last sync need no API call
+                if upsert and self.sync_cache and self.sync_cache.is_unchanged(record["fields"]):
+                    unchanged_records.append(record)
+                    saved_jobs.append(job)
+                    continue
                 records.append(record)
+                record_jobs.append(job)
             
             # Process records in batches of 10
             batch_size = 10
             total_saved = 0
+            created = 0
+            updated = 0
             
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                payload = {"records": batch}
-                
-                response = requests.post(self.api_url, headers=headers, data=json.dumps(payload))
-                
-                if response.status_code == 200:
-                    batch_count = len(batch)
-                    total_saved += batch_count
-                    logger.info(f"Successfully saved batch of {batch_count} jobs to Airtable")
-                    
-                    # Optional: Add a small delay between batches to avoid rate limiting
-                    if i + batch_size < len(records):  # Don't sleep after the last batch
-                        time.sleep(0.2)  # 200ms delay
-                else:
-                    logger.error(f"Failed to save batch to Airtable: {response.status_code}, {response.text}")
-                    # Continue with remaining batches even if one fails
+            # Refresh synced_at so compaction keeps entries for postings still listed
+            if unchanged_records:
+                self.sync_cache.record(unchanged_records)
+            
+            batches = [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+            if upsert:
+                # Merge on Job Link so retries and reruns update rows instead of duplicating them
+                method = "PATCH"
+                payloads = [{"performUpsert": {"fieldsToMergeOn": ["Job Link"]}, "records": batch} for batch in batches]
+            else:
+                method = "POST"
+                payloads = [{"records": batch} for batch in batches]
+            
+            # Failed batches are dead-lettered by the writer; the rest continue
+            responses = self.airtable_writer.send_batches(method, self.api_url, payloads)
+            for batch_index, (batch, body) in enumerate(zip(batches, responses)):
+                if body is None:
+                    continue
+                batch_count = len(batch)
+                total_saved += batch_count
+                saved_jobs.extend(record_jobs[batch_index * batch_size:(batch_index + 1) * batch_size])
+                if upsert:
+                    created += len(body.get("createdRecords", []))
+                    updated += len(body.get("updatedRecords", []))
+                    if self.sync_cache:
+                        self.sync_cache.record(batch)
+                logger.info(f"Successfully saved batch of {batch_count} jobs to Airtable")
             
             logger.info(f"Total jobs saved to Airtable: {total_saved}/{len(jobs)}")
+            if upsert:
+                logger.info(f"Airtable upsert: {created} created, {updated} updated, {len(unchanged_records)} unchanged")
             
         except Exception as e:
             logger.error(f"Error while saving to Airtable: {e}")
+        
+        return saved_jobs
    
-    def run_scraper(self):
-        """Main scraper execution"""
+    def write_metrics(self):
+        """Write the run's stage timings and counters to the configured JSON and Prometheus files"""
+        metrics_config = self.config.get('metrics', {})
+        json_path = metrics_config.get('json_path', 'scraper_metrics.json')
+        prometheus_path = metrics_config.get('prometheus_path', 'scraper_metrics.prom')
+        try:
+            if json_path:
+                self.metrics.write_json(json_path)
+            if prometheus_path:
+                self.metrics.write_prometheus(prometheus_path)
+        except OSError as e:
+            logger.error(f"Failed to write run metrics: {e}")
+
+    def export_jobs(self, jobs: List[Job]):
+        """Write this run's deduplicated jobs to the local export directory for offline analytics"""
+        export_config = self.config.get('export', {})
+        if not export_config.get('enabled', False) or not jobs:
+            return
+        batch = JobColumns(jobs)
+        stem = f"jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        with self.metrics.stage("export"):
+            written = batch.export(export_config.get('directory', 'exports'),
+                                   export_config.get('formats', ['jsonl', 'csv']), stem)
+        if written:
+            logger.info(f"Exported {len(batch)} jobs to {', '.join(written)}")
+
+    def open_work_queue(self) -> WorkQueue:
+        queue_config = self.config.get('queue', {})
+        return WorkQueue(queue_config.get('path', 'work_queue.db'),
+                         lease_seconds=queue_config.get('lease_seconds', 900),
+                         max_attempts=queue_config.get('max_attempts', 3))
+
+    def build_queue_tasks(self, platforms: List[str]) -> List[Tuple[str, str, int]]:
+        """One task per HTTP result page, or per role for browser engines whose pages load by scrolling"""
+        max_pages = self.config.get('scraping', {}).get('max_pages_per_site', 1)
+        scrapers = self.get_platform_scrapers(platforms)
+        tasks = []
+        for role in self.target_roles:
+            for platform in scrapers:
+                pages = range(max_pages) if platform.engine == 'http' else [0]
+                tasks.extend((platform.name, role, page) for page in pages)
+        return tasks
+
+    def enqueue_work(self, platforms: Optional[List[str]] = None) -> int:
+        """Coordinator: queue the platform x role x page matrix for worker processes"""
+        work_queue = self.open_work_queue()
+        try:
+            work_queue.prune()
+            added = work_queue.enqueue(self.build_queue_tasks(platforms or self.platforms))
+            logger.info(f"Enqueued {added} task(s); {work_queue.outstanding()} outstanding")
+        finally:
+            work_queue.close()
+        return added
+
+    def run_queue_task(self, platform: str, role: str, page: int, session: requests.Session, get_driver) -> List[Job]:
+        """Run one queued task with the existing scrape logic, raising if the role scraper reported a failure"""
+        failures_before = self.metrics.value("role_failures", platform, role)
+        scraper = PLATFORM_SCRAPERS[platform.lower()](self)
+        if scraper.engine == 'http':
+            jobs = scraper.scrape_page_http(session, role, page)
+        else:
+            jobs = scraper.scrape_role_browser(get_driver(), role)
+        if self.metrics.value("role_failures", platform, role) > failures_before:
+            raise RuntimeError(f"{platform} role '{role}' reported a scraping failure")
+        return jobs
+
+    def run_worker(self):
+        """Worker: claim queued tasks and stage their jobs until the queue is empty or SIGTERM arrives"""
+        queue_config = self.config.get('queue', {})
+        worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        signal.signal(signal.SIGTERM, self.handle_stop_signal)
+        signal.signal(signal.SIGINT, self.handle_stop_signal)
+        
+        work_queue = self.open_work_queue()
+        staging = StagingArea(queue_config.get('staging_dir', 'staging'))
+        session = self.create_http_session(1)
+        driver = None
+        
+        def get_driver():
+            # The browser starts on the first browser task, so HTTP-only workers never launch Chrome
+            nonlocal driver
+            if driver is None:
+                driver = self.setup_driver()
+            return driver
+        
+        completed = 0
+        logger.info(f"Worker {worker_id} started")
+        try:
+            while not self.stop_requested.is_set():
+                task = work_queue.claim(worker_id)
+                if task is None:
+                    # Leased tasks may still come back if their worker dies
+                    if work_queue.outstanding() == 0:
+                        break
+                    self.stop_requested.wait(queue_config.get('poll_seconds', 10))
+                    continue
+                
+                task_id, platform, role, page = task
+                logger.info(f"Worker {worker_id} claimed task {task_id}: {platform} '{role}' page {page}")
+                try:
+                    jobs = self.run_queue_task(platform, role, page, session, get_driver)
+                    if jobs:
+                        staging.write(f"{platform.lower()}-{task_id}-{worker_id}", jobs)
+                    work_queue.complete(task_id, worker_id)
+                    completed += 1
+                    if driver is not None and self.driver_watchdog.needs_recycle(driver):
+                        try:
+                            driver.quit()
+                        except Exception:
+                            pass
+                        self.driver_watchdog.forget(driver)
+                        driver = None
+                except Exception as e:
+                    logger.error(f"Task {task_id} failed: {e}")
+                    work_queue.fail(task_id, worker_id, str(e))
+                    if driver is not None:
+                        # Start the next browser task on a fresh Chrome in case this one crashed
+                        try:
+                            driver.quit()
+                        except Exception:
+                            pass
+                        driver = None
+        finally:
+            session.close()
+            if driver is not None:
+                driver.quit()
+            work_queue.close()
+            logger.info(f"Worker {worker_id} stopped after {completed} task(s); rates: {self.politeness.describe()}")
+
+    def drain_staging(self) -> List[Job]:
+        """Uploader: dedupe every staged job file into Airtable, then delete the files"""
+        staging = StagingArea(self.config.get('queue', {}).get('staging_dir', 'staging'))
+        # Files that land while we upload wait for the next drain
+        paths = staging.pending_files()
+        if not paths:
+            logger.info("Staging area is empty, nothing to upload")
+            return []
+        
+        self.metrics = RunMetrics()
+        self.open_stores()
+        try:
+            jobs = staging.load(paths)
+            logger.info(f"Draining {len(jobs)} job(s) from {len(paths)} staged file(s)")
+            unique_jobs, new_jobs = self.dedupe_and_upload(jobs)
+            self.export_jobs(unique_jobs)
+            # The staged files are the only copy until every sink has written their jobs
+            if self.close_sinks():
+                staging.remove(paths)
+            else:
+                logger.warning(f"A sink failed to write some jobs; keeping {len(paths)} staged file(s) for the next drain")
+            return new_jobs
+        finally:
+            self.close_stores()
+            self.write_metrics()
+
+    def handle_stop_signal(self, signum, frame):
+        """First SIGTERM/SIGINT lets the current run finish its in-flight work items; a second exits at once"""
+        if self.stop_requested.is_set():
+            raise SystemExit(1)
+        logger.info(f"Received signal {signum}, shutting down after the current work items finish")
+        self.stop_requested.set()
+
+    def check_pool_health(self):
+        """Replace warm drivers that crashed or hung between runs"""
+        replaced = 0
+        for key, pool in self.driver_pools.items():
+            # An exception here would stop the daemon's scheduler loop
+            try:
+                replaced += pool.check_health()
+            except Exception as e:
+                logger.error(f"Health check of the {key} driver pool failed: {e}")
+        if replaced:
+            logger.info(f"Health check replaced {replaced} driver(s)")
+        else:
+            logger.debug("Health check: all drivers responsive")
+
+    def run_platform(self, platform: str, settings: Dict):
+        """One scheduled daemon run for a single platform"""
+        if self.stop_requested.is_set():
+            return
+        default_window = self.config.get('scraping', {}).get('linkedin_time_window', 86400)
+        self.linkedin_time_window = settings.get('linkedin_time_window', default_window)
+        self.run_scraper([platform])
+        logger.info(f"Next {platform} run in {settings.get('interval_minutes', 60)} minutes")
+
+    def run_daemon(self):
+        """Scrape each platform on its own interval with a warm driver pool until SIGTERM"""
+        daemon_config = self.config.get('daemon', {})
+        platform_settings = daemon_config.get('platforms', {})
+        stagger = daemon_config.get('stagger_seconds', 120)
+        self.keep_pool_warm = True
+        signal.signal(signal.SIGTERM, self.handle_stop_signal)
+        signal.signal(signal.SIGINT, self.handle_stop_signal)
+        
+        scheduler = schedule.Scheduler()
+        for index, platform in enumerate(self.platforms):
+            settings = platform_settings.get(platform, {})
+            job = scheduler.every(settings.get('interval_minutes', 60)).minutes.do(self.run_platform, platform, settings)
+            # Stagger first runs so platforms don't start together and keep their offset afterwards
+            job.next_run = datetime.now() + timedelta(seconds=stagger * index)
+            logger.info(f"Scheduled {platform} every {settings.get('interval_minutes', 60)} minutes, "
+                        f"first run in {stagger * index}s")
+        scheduler.every(daemon_config.get('health_check_minutes', 10)).minutes.do(self.check_pool_health)
+        
+        logger.info("Daemon started")
+        try:
+            while not self.stop_requested.is_set():
+                scheduler.run_pending()
+                idle = scheduler.idle_seconds
+                self.stop_requested.wait(min(max(idle or 0, 1), 60))
+        finally:
+            self.keep_pool_warm = False
+            self.close_driver_pools()
+            logger.info("Daemon stopped")
+
+    def open_stores(self, with_sinks: bool = True):
+        """Open the cross-run dedupe store, the Airtable sync cache when upserting, and the configured sinks"""
+        dedupe_config = self.config.get('dedupe', {})
+        self.seen_store = SeenJobStore(dedupe_config.get('path', 'seen_jobs.db'),
+                                       dedupe_config.get('ttl_days', 30))
+        if self.config.get('airtable', {}).get('upsert', False):
+            self.sync_cache = AirtableSyncCache(dedupe_config.get('path', 'seen_jobs.db'),
+                                                dedupe_config.get('ttl_days', 30))
+        if with_sinks:
+            self.sinks = self.open_sinks()
+
+    def sink_settings(self) -> List[Dict]:
+        # Without a sinks section the scraper behaves as before: Airtable only
+        return self.config.get('sinks', [{"type": "airtable"}])
+
+    def open_sinks(self) -> List[BufferedSink]:
+        """Start a buffered writer for every configured sink"""
+        buffer_config = self.config.get('sink_buffer', {})
+        sinks = []
+        for settings in self.sink_settings():
+            sink_type = settings.get('type')
+            try:
+                if sink_type == 'airtable':
+                    sink = AirtableJobSink(self)
+                elif sink_type in SINK_TYPES:
+                    sink = SINK_TYPES[sink_type](**{k: v for k, v in settings.items() if k != 'type'})
+                else:
+                    logger.warning(f"Unknown sink type '{sink_type}', skipping")
+                    continue
+            except Exception as e:
+                logger.error(f"Failed to open {sink_type} sink: {e}")
+                continue
+            sinks.append(BufferedSink(sink, buffer_config.get('batch_size', 1000),
+                                      buffer_config.get('flush_seconds', 2)))
+        return sinks
+
+    def close_sinks(self) -> bool:
+        """Flush and close every sink, returning whether all of them wrote everything they were given"""
+        flushed = True
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error(f"Failed to close {sink.sink.name} sink: {e}")
+                flushed = False
+            flushed = flushed and sink.failed == 0
+        self.sinks = []
+        return flushed
+
+    def close_stores(self):
+        # Sinks first: the Airtable sink still records into the seen store while it drains
+        self.close_sinks()
+        if self.seen_store:
+            self.seen_store.close()
+            self.seen_store = None
+        if self.sync_cache:
+            self.sync_cache.close()
+            self.sync_cache = None
+
+    def dedupe_jobs(self, all_jobs: List[Job]) -> List[Job]:
+        """Drop exact duplicates, then fold near-duplicates listed on several platforms into one job"""
+        # Filter out duplicates across platforms
+        unique_jobs = []
+        seen_keys = set()
+        
+        with self.metrics.stage("dedupe"):
+            for job in all_jobs:
+                job_key = job.get_dedupe_key()
+                if job_key not in seen_keys:
+                    unique_jobs.append(job)
+                    seen_keys.add(job_key)
+        
+        # Then fold the same posting listed on several platforms into one job
+        dedupe_config = self.config.get('dedupe', {})
+        if dedupe_config.get('fuzzy', True):
+            with self.metrics.stage("dedupe"):
+                exact_count = len(unique_jobs)
+                unique_jobs = merge_duplicate_jobs(unique_jobs, dedupe_config.get('similarity_threshold', 0.8),
+                                                   dedupe_config.get('company_aliases'))
+            logger.info(f"Fuzzy dedupe merged {exact_count - len(unique_jobs)} near-duplicate jobs")
+        
+        logger.info(f"Found {len(unique_jobs)} unique jobs after deduplication")
+        return unique_jobs
+
+    def replay_dead_letters(self):
+        """Replay the dead-letter file and mark the records that went through as seen and synced,
+        so this run's seen-store filter does not upload them a second time"""
+        records = self.airtable_writer.replay_dead_letters()
+        if not records:
+            return
+        source_links_field = self.config.get('airtable', {}).get('source_links_field')
+        jobs = []
+        for record in records:
+            fields = record.get("fields", {})
+            job = Job(fields.get("Company Name", ""), fields.get("Platform", ""), fields.get("Job Title", ""),
+                      fields.get("Job Type", ""), fields.get("Job Link", ""), fields.get("Posted Time", ""),
+                      location=fields.get("Location", ""))
+            if source_links_field and fields.get(source_links_field):
+                job.source_links = fields[source_links_field].split("\n")
+            jobs.append(job)
+        self.seen_store.record(jobs)
+        if self.sync_cache:
+            self.sync_cache.record(records)
+
+    def dedupe_and_upload(self, all_jobs: List[Job], streamed: bool = False) -> Tuple[List[Job], List[Job]]:
+        """Dedupe scraped jobs, upload the ones earlier runs have not seen, and return (unique, new) jobs.
+        With streamed set, local sinks already got the raw jobs per work item and only upserting ones get more."""
+        unique_jobs = self.dedupe_jobs(all_jobs)
+        if any(sink.sink.new_only for sink in self.sinks):
+            with self.metrics.stage("airtable_upload"):
+                # Retry anything a previous run had to give up on before adding new rows
+                self.replay_dead_letters()
+        
+        # Only jobs missing from earlier runs reach Airtable; local sinks keep every unique job
+        with self.metrics.stage("dedupe"):
+            new_jobs = self.seen_store.filter_new(unique_jobs)
+        upload_jobs = new_jobs
+        if self.sync_cache:
+            # Upserts also resend seen postings whose fields changed since their last sync;
+            # save_to_airtable skips the ones the sync cache shows unchanged
+            upload_jobs = unique_jobs
+        self.enrich_jobs(upload_jobs)
+        for sink in self.sinks:
+            if sink.sink.new_only:
+                sink.submit(upload_jobs)
+            elif not streamed or sink.sink.upserts:
+                # Upserting sinks overwrite the streamed rows with the merged, enriched jobs
+                sink.submit(unique_jobs)
+        self.seen_store.compact()
+        if self.sync_cache:
+            self.sync_cache.compact()
+        return unique_jobs, new_jobs
+
+    def archive_page(self, platform: str, role: str, page: int, page_source: str):
+        """Save a result page when recording; page is 0-based"""
+        if self.page_archive is None:
+            return
+        try:
+            self.page_archive.add(platform, role, page, page_source)
+        except Exception as e:
+            logger.error(f"Failed to archive {platform} page {page} for role '{role}': {e}")
+
+    def record_run(self, archive_path: str) -> List[Job]:
+        """A normal run that also saves every result page to the archive"""
+        self.page_archive = PageArchive(archive_path, mode="w")
+        try:
+            return self.run_scraper()
+        finally:
+            self.page_archive.close()
+            self.page_archive = None
+            logger.info(f"Recorded result pages to {archive_path}")
+
+    def replay_archive(self, archive_path: str, output_path: Optional[str] = None) -> List[Job]:
+        """Run extraction, filtering and dedupe over an archive with no browser, network or uploads"""
         start_time = time.time()
-        logger.info("Starting job scraper for Saudi Arabia...")
+        self.metrics = RunMetrics()
+        with self.seen_jobs_lock:
+            self.seen_jobs = set()
+        archive = PageArchive(archive_path)
+        platforms = {}
+        all_jobs = []
+        try:
+            entries = archive.entries()
+            logger.info(f"Replaying {len(entries)} page(s) from {archive_path}")
+            # Sequential on purpose: in-run dedupe keeps the first copy, so order must not vary
+            for entry in entries:
+                key = entry["platform"].lower()
+                if key not in PLATFORM_SCRAPERS:
+                    logger.warning(f"Skipping page for unknown platform '{entry['platform']}'")
+                    continue
+                platform = platforms.setdefault(key, PLATFORM_SCRAPERS[key](self))
+                all_jobs.extend(platform.extract_page(entry["role"], entry["page"], archive.read(entry)))
+        finally:
+            archive.close()
+        
+        unique_jobs = self.dedupe_jobs(all_jobs)
+        if output_path:
+            JobColumns(unique_jobs).write_jsonl(output_path)
+            logger.info(f"Wrote {len(unique_jobs)} replayed jobs to {output_path}")
+        
+        print(f"\n{'='*50}")
+        print(f"REPLAY SUMMARY")
+        print(f"{'='*50}")
+        print(f"Pages: {len(entries)}")
+        print(f"Jobs extracted: {len(all_jobs)}")
+        print(f"Unique jobs: {len(unique_jobs)}")
+        for name in sorted({job.platform for job in unique_jobs}):
+            print(f"{name}: {len([j for j in unique_jobs if j.platform == name])}")
+        print(f"Run duration: {round(time.time() - start_time, 2)}s")
+        for stage, seconds in self.metrics.stage_totals().items():
+            print(f"  {stage}: {seconds}s")
+        print(f"{'='*50}")
+        return unique_jobs
+
+    def fetch_job_detail(self, session: requests.Session, platform: PlatformScraper, url: str) -> Optional[Dict]:
+        """Fetch and parse one detail page, returning None if the fetch failed"""
+        self.politeness.wait(platform.domain)
+        try:
+            response = session.get(url, timeout=30)
+        except requests.RequestException as e:
+            logger.error(f"Error fetching job detail {url}: {e}")
+            return None
+        if response.status_code in THROTTLE_STATUS_CODES:
+            self.politeness.backoff(platform.domain, f"HTTP {response.status_code}")
+        if response.status_code != 200:
+            logger.error(f"Failed to fetch job detail {url}: {response.status_code}")
+            return None
+        if self.check_block_signal(platform.domain, response.url, html_title(response.text)):
+            return None
+        self.politeness.success(platform.domain)
+        return platform.parse_detail(response.text)
+
+    def apply_job_detail(self, job: Job, details: Dict):
+        snippet_length = self.config.get('enrichment', {}).get('snippet_length', 300)
+        description = details.get('description', '')
+        if description:
+            job.description_snippet = description[:snippet_length]
+        job.employment_type = details.get('employment_type') or job.employment_type
+        # The posting's own workplace type beats keyword guessing on the title and location
+        workplace_type = details.get('workplace_type')
+        if workplace_type in ("Remote", "Hybrid"):
+            job.job_type = workplace_type
+        elif workplace_type == "On-site":
+            job.job_type = "Offline"
+        elif description:
+            job.job_type = self.determine_job_type(f"{job.job_title} {job.location} {description}")
+
+    def enrich_jobs(self, jobs: List[Job]):
+        """Fill description, employment type and workplace type from detail pages, fetching each posting once per TTL.
+        Enrichment is best effort: a failure is logged and counted, and the job goes on un-enriched."""
+        enrichment_config = self.config.get('enrichment', {})
+        if not enrichment_config.get('enabled', False) or not jobs:
+            return
         
         try:
-            # Setup driver
-            self.setup_driver()
+            cache = JobDetailCache(enrichment_config.get('cache_path', 'job_details.db'),
+                                   enrichment_config.get('ttl_days', 14))
+        except Exception as e:
+            logger.error(f"Enrichment skipped, the detail cache could not be opened: {e}")
+            self.metrics.count("enrichment_errors", len(jobs))
+            return
+        platforms = {key: cls(self) for key, cls in PLATFORM_SCRAPERS.items()}
+        to_fetch = []
+        cached = 0
+        fetched = 0
+        try:
+            for job in jobs:
+                platform = platforms.get(job.platform.lower())
+                url = platform.detail_url(job) if platform else None
+                if not url:
+                    continue
+                try:
+                    details = cache.get(job.get_dedupe_key())
+                    if details is not None:
+                        self.apply_job_detail(job, details)
+                        cached += 1
+                        continue
+                except Exception as e:
+                    logger.error(f"Enrichment cache lookup failed for {url}: {e}")
+                    self.metrics.count("enrichment_errors", 1, job.platform)
+                to_fetch.append((job, platform, url))
             
-            # Scrape all platforms
-            all_jobs = []
+            workers = enrichment_config.get('workers', 4)
             
-            # LinkedIn
-            linkedin_jobs = self.scrape_linkedin()
-            all_jobs.extend(linkedin_jobs)
+            def enrich(item) -> bool:
+                job, platform, url = item
+                try:
+                    details = self.fetch_job_detail(session, platform, url)
+                    if details is None:
+                        return False
+                    # Pages that parse to nothing are cached too, so they are not refetched every run
+                    cache.put(job.get_dedupe_key(), details)
+                    self.apply_job_detail(job, details)
+                    return True
+                except Exception as e:
+                    logger.error(f"Enrichment failed for {url}: {e}")
+                    self.metrics.count("enrichment_errors", 1, job.platform)
+                    return False
             
-            # Indeed
-            # indeed_jobs = self.scrape_indeed()
-            # all_jobs.extend(indeed_jobs)
+            if to_fetch:
+                session = self.create_http_session(workers)
+                try:
+                    with self.metrics.stage("enrichment"):
+                        with ThreadPoolExecutor(max_workers=workers) as executor:
+                            fetched = sum(executor.map(enrich, to_fetch))
+                finally:
+                    session.close()
+        except Exception as e:
+            logger.error(f"Enrichment stopped early, remaining jobs go un-enriched: {e}")
+            self.metrics.count("enrichment_errors", 1)
+        finally:
+            cache.close()
+        self.metrics.count("details_fetched", fetched)
+        self.metrics.count("details_cached", cached)
+        logger.info(f"Enrichment: {fetched}/{len(to_fetch)} detail page(s) fetched, {cached} from cache")
+
+    def resync_from_sink(self, since_days: Optional[float] = None) -> List[Job]:
+        """Upload jobs from the local SQLite sink that never made it to Airtable"""
+        settings = next((s for s in self.sink_settings() if s.get('type') == 'sqlite'), {})
+        path = settings.get('path', 'jobs.db')
+        if not os.path.exists(path):
+            logger.error(f"No SQLite sink at {path}, nothing to resync")
+            return []
+        
+        self.metrics = RunMetrics()
+        # The SQLite sink is only read here, so the configured sinks stay closed
+        self.open_stores(with_sinks=False)
+        local_sink = SQLiteJobSink(path)
+        try:
+            jobs = local_sink.load(since_days)
+            logger.info(f"Resyncing {len(jobs)} job(s) from {path}")
+            self.replay_dead_letters()
+            new_jobs = self.seen_store.filter_new(jobs)
+            if new_jobs:
+                AirtableJobSink(self).write(new_jobs)
+            return new_jobs
+        finally:
+            local_sink.close()
+            self.close_stores()
+            self.write_metrics()
+
+    def run_scraper(self, platforms: Optional[List[str]] = None):
+        """Main scraper execution, optionally limited to some platforms"""
+        start_time = time.time()
+        platforms = platforms or self.platforms
+        logger.info(f"Starting job scraper for Saudi Arabia ({', '.join(platforms)})...")
+        # Per-run state; daemon mode calls this repeatedly on one scraper
+        self.metrics = RunMetrics()
+        with self.seen_jobs_lock:
+            self.seen_jobs = set()
+        
+        try:
+            self.open_stores()
             
-            # Bayt
-            bayt_jobs = self.scrape_bayt()
-            all_jobs.extend(bayt_jobs)
+            # Work items finished by an interrupted earlier run are reused instead of re-scraped.
+            # Only this run's platforms: a daemon run for one platform leaves the others' items alone
+            scrapers = self.get_platform_scrapers(platforms)
+            platform_names = [platform.name for platform in scrapers]
+            checkpoint_config = self.config.get('checkpoint', {})
+            self.checkpoint = RunCheckpoint(checkpoint_config.get('path', 'scrape_checkpoint.db'),
+                                            checkpoint_config.get('max_age_hours', 12))
+            resumed = self.checkpoint.completed(platform_names)
+            self.resumed_items = set(resumed)
+            if resumed:
+                logger.info(f"Resuming from checkpoint: {len(resumed)} work item(s) already completed, "
+                            f"{sum(len(jobs) for jobs in resumed.values())} job(s) restored")
             
-            # Filter out duplicates across platforms
-            unique_jobs = []
-            # seen_hashes = set()
+            # Each platform runs in its own thread with its own driver pool or session,
+            # so the run takes as long as the slowest platform and one failure stays contained
+            all_jobs = []
+            results: Dict[str, List[Job]] = {}
+            with ThreadPoolExecutor(max_workers=max(1, len(scrapers))) as platform_executor:
+                futures = {platform.name: platform_executor.submit(self.scrape_platform, platform)
+                           for platform in scrapers}
+                for name, future in futures.items():
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"{name} scraping failed: {e}")
+                        self.metrics.count("platform_failures", 1, name)
+                        results[name] = []
             
-            for job in all_jobs:
-                # job_hash = job.get_hash()
-                # if job_hash not in seen_hashes:
-                unique_jobs.append(job)
-                # seen_hashes.add(job_hash)
+            for (platform, role), role_jobs in resumed.items():
+                results.setdefault(platform, []).extend(role_jobs)
+                # The interrupted run may have died before its sinks flushed these
+                self.stream_to_sinks(role_jobs)
             
-            logger.info(f"Found {len(unique_jobs)} unique jobs after deduplication")
+            for platform_jobs in results.values():
+                all_jobs.extend(platform_jobs)
             
-            if unique_jobs:
-               self.save_to_airtable(unique_jobs)  # Added Airtable save call here
+            logger.info(f"Politeness rates: {self.politeness.describe()}")
+            unique_jobs, new_jobs = self.dedupe_and_upload(all_jobs, streamed=True)
+            self.export_jobs(unique_jobs)
+            # Forget the work items only once every sink has written them (Airtable rows or dead letters)
+            if self.close_sinks():
+                self.checkpoint.clear(platform_names)
+            else:
+                logger.warning("A sink failed to write some jobs; keeping the checkpoint so the next run retries them")
  
             # Calculate metrics
             total_jobs = len(unique_jobs)
@@ -983,12 +4214,16 @@ class JobScraper:
             print(f"SCRAPING SUMMARY")
             print(f"{'='*50}")
             print(f"Total jobs found: {total_jobs}")
+            print(f"New jobs: {len(new_jobs)}")
             print(f"Remote jobs: {remote_jobs}")
             print(f"Hybrid jobs: {hybrid_jobs}")
             print(f"LinkedIn: {linkedin_count}")
             print(f"Indeed: {indeed_count}")
             print(f"Bayt: {bayt_count}")
             print(f"Run duration: {run_duration}s")
+            print(f"Request rates: {self.politeness.describe()}")
+            for stage, seconds in self.metrics.stage_totals().items():
+                print(f"  {stage}: {seconds}s")
             print(f"{'='*50}")
             
             return unique_jobs
@@ -1011,12 +4246,69 @@ class JobScraper:
             return []
         
         finally:
-            if self.driver:
-                self.driver.quit()
+            if not self.keep_pool_warm:
+                self.close_driver_pools()
+            self.close_stores()
+            if self.checkpoint:
+                self.checkpoint.close()
+            self.write_metrics()
 
 def main():
     """Main execution function"""
-    scraper = JobScraper()
+    parser = argparse.ArgumentParser(description="Scrape Saudi Arabia job postings into Airtable")
+    parser.add_argument("--config", default="config.json", help="path to the JSON config file")
+    parser.add_argument("--platforms",
+                        help=f"comma-separated platforms to scrape ({', '.join(PLATFORM_SCRAPERS)}); "
+                             f"defaults to scraping.platforms in the config")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--daemon", action="store_true",
+                      help="keep running, scraping each platform on the intervals in the daemon config")
+    mode.add_argument("--enqueue", action="store_true",
+                      help="queue (platform, role, page) tasks for --worker processes")
+    mode.add_argument("--worker", action="store_true",
+                      help="claim queued tasks and write their jobs to the staging directory")
+    mode.add_argument("--drain", action="store_true",
+                      help="upload staged jobs to Airtable")
+    mode.add_argument("--resync", action="store_true",
+                      help="upload jobs from the local SQLite sink that Airtable does not have yet")
+    mode.add_argument("--record", metavar="ARCHIVE",
+                      help="run normally and save every result page to this archive directory")
+    mode.add_argument("--replay", metavar="ARCHIVE",
+                      help="rerun extraction, filtering and dedupe over a recorded archive, offline")
+    parser.add_argument("--replay-output", metavar="PATH",
+                        help="with --replay, write the resulting jobs to this JSONL file")
+    parser.add_argument("--since-days", type=float,
+                        help="with --resync, only replay jobs scraped in the last N days")
+    args = parser.parse_args()
+    
+    platforms = None
+    if args.platforms:
+        platforms = [p.strip().lower() for p in args.platforms.split(',') if p.strip()]
+        unknown = [p for p in platforms if p not in PLATFORM_SCRAPERS]
+        if unknown or not platforms:
+            parser.error(f"unknown platform(s): {', '.join(unknown) or args.platforms!r} "
+                         f"(available: {', '.join(PLATFORM_SCRAPERS)})")
+    
+    scraper = JobScraper(args.config)
+    if platforms:
+        scraper.platforms = platforms
+    if args.daemon:
+        scraper.run_daemon()
+        return []
+    if args.enqueue:
+        scraper.enqueue_work()
+        return []
+    if args.worker:
+        scraper.run_worker()
+        return []
+    if args.drain:
+        return scraper.drain_staging()
+    if args.resync:
+        return scraper.resync_from_sink(args.since_days)
+    if args.record:
+        return scraper.record_run(args.record)
+    if args.replay:
+        return scraper.replay_archive(args.replay, args.replay_output)
     jobs = scraper.run_scraper()
     return jobs
 
@@ -0,0 +1,132 @@
+"""Tests for the LinkedIn guest-API (HTTP) scraping path
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import gzip
+import json
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import script  # noqa: E402
+
+FRAGMENT_PATH = os.path.join(REPO_DIR, "benchmarks", "fixtures", "linkedin_guest_fragment.html.gz")
+
+
+@pytest.fixture
+def fragment():
+    with gzip.open(FRAGMENT_PATH, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    monkeypatch.setenv("AIRTABLE_API_KEY", "test-key")
+    monkeypatch.setenv("AIRTABLE_BASE_ID", "test-base")
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"scraping": {"max_pages_per_site": 5}}))
+    scraper = script.JobScraper(str(config_path))
+    monkeypatch.setattr(scraper.politeness, "wait", lambda domain: None)
+    return scraper
+
+
+def guest_response(status_code, text="",
+                   url="https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"):
+    response = mock.Mock(status_code=status_code, text=text)
+    response.url = url
+    return response
+
+
+def test_extract_linkedin_page_parses_guest_fragment(scraper, fragment):
+    jobs, card_fields = scraper.extract_linkedin_page("Developer", fragment)
+
+    assert len(card_fields) == 10
+    assert len(jobs) == 10
+    first = jobs[0]
+    assert first.platform == "LinkedIn"
+    assert first.job_title == "Full Stack Developer"
+    assert first.company_name == "Norrial Studio"
+    assert first.location == "Jeddah, Jeddah, Saudi Arabia"
+    assert first.job_link == "https://sa.linkedin.com/jobs/view/full-stack-developer-at-norrial-studio-3771662310"
+    for job in jobs:
+        assert job.job_title and job.company_name and job.location
+        assert job.job_link.startswith("https://sa.linkedin.com/jobs/view/")
+
+
+@pytest.mark.parametrize("last_response", [guest_response(200, ""), guest_response(400)],
+                         ids=["empty-fragment", "http-400"])
+def test_scrape_linkedin_role_http_stops_at_end_of_results(scraper, fragment, last_response):
+    session = mock.Mock()
+    session.get.side_effect = [guest_response(200, fragment), last_response]
+
+    jobs = scraper.scrape_linkedin_role_http(session, "Developer")
+
+    assert len(jobs) == 10
+    assert session.get.call_count == 2
+    params = [call.kwargs["params"] for call in session.get.call_args_list]
+    assert [p["start"] for p in params] == [0, 10]
+    assert all(p["sortBy"] == "DD" for p in params)
+    assert scraper.metrics.value("role_failures", "LinkedIn", "Developer") == 0
+
+
+def test_empty_first_fragment_ends_role_without_failure(scraper):
+    session = mock.Mock()
+    session.get.side_effect = [guest_response(200, "")]
+
+    jobs = scraper.scrape_linkedin_role_http(session, "Developer")
+
+    assert jobs == []
+    assert session.get.call_count == 1
+    assert scraper.metrics.value("role_failures", "LinkedIn", "Developer") == 0
+
+
+@pytest.mark.parametrize("response", [
+    guest_response(429),
+    guest_response(503),
+    guest_response(999),
+    guest_response(200, "<html><body>Sign in</body></html>", url="https://www.linkedin.com/authwall?trk=guest"),
+    guest_response(200, "<html><head><title>Security Verification</title></head></html>"),
+], ids=["http-429", "http-503", "http-999", "login-wall", "captcha"])
+def test_throttled_or_blocked_fetch_counts_as_role_failure(scraper, fragment, response):
+    session = mock.Mock()
+    session.get.side_effect = [guest_response(200, fragment), response]
+    backoff = mock.Mock(wraps=scraper.politeness.backoff)
+    scraper.politeness.backoff = backoff
+
+    jobs = scraper.scrape_linkedin_role_http(session, "Developer")
+
+    # The first page is kept, pagination stops, and the role is reported as failed
+    assert len(jobs) == 10
+    assert session.get.call_count == 2
+    assert scraper.metrics.value("role_failures", "LinkedIn", "Developer") == 1
+    assert backoff.call_args.args[0] == "linkedin.com"
+
+
+def test_queue_task_raises_when_fetch_is_throttled(scraper):
+    scraper.config["scraping"]["linkedin_engine"] = "http"
+    session = mock.Mock()
+    session.get.return_value = guest_response(429)
+
+    with pytest.raises(RuntimeError):
+        scraper.run_queue_task("LinkedIn", "Developer", 0, session, get_driver=None)
+
+
+def test_throttled_role_is_checkpointed_as_failed(scraper, fragment, tmp_path):
+    scraper.checkpoint = script.RunCheckpoint(str(tmp_path / "checkpoint.db"))
+    session = mock.Mock()
+    session.get.side_effect = [guest_response(200, fragment), guest_response(429)]
+
+    jobs = scraper.scrape_checkpointed(
+        "LinkedIn", "Developer", lambda: scraper.scrape_linkedin_role_http(session, "Developer"))
+
+    assert len(jobs) == 10
+    assert scraper.checkpoint.completed() == {}
+    status = scraper.checkpoint.conn.execute("SELECT status FROM work_items").fetchone()[0]
+    assert status == "failed"
+    scraper.checkpoint.close()